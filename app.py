@@ -1,25 +1,41 @@
 import streamlit as st
 import pandas as pd
 import requests
-import xml.etree.ElementTree as ET
-import base64
-from bs4 import BeautifulSoup
+from lxml import etree
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
 import concurrent.futures
+import threading
+from cachetools import LRUCache, TTLCache
 import time
 from datetime import datetime
+import gzip
+import io
 import re
 import logging
 import asyncio
+from functools import lru_cache
 from typing import Optional, Tuple
 
 # Import our new modules
 from content_extractor import ContentExtractor, extract_content_sync
-from openrouter_client import OpenRouterClient, generate_description_sync
+from utils import create_session, dedupe_urls, host_slot
+from openrouter_client import (
+    OpenRouterClient,
+    generate_description_sync,
+    generate_descriptions_batch_sync
+)
 from config import (
     DEFAULT_LLM_MODELS,
     DEFAULT_MODEL,
     MIN_CONTENT_LENGTH,
+    HTML_PARSER,
+    MAX_WORKERS,
+    MD_PROBE_HOST_GIVE_UP,
+    MD_PROBE_HOST_STATS_TTL,
+    SITEMAP_MAX_WORKERS,
+    URL_LIST_CACHE_TTL,
     CATEGORIZED_LLM_MODELS,
     validate_custom_model,
     get_model_display_name
@@ -28,6 +44,11 @@ from config import (
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+# Shared HTTP session so sitemap and robots.txt requests reuse pooled connections
+SESSION = create_session()
+# .md probes don't retry, so a slow host can't hold a host_slot far past the probe timeout
+PROBE_SESSION = create_session(max_retries=0)
+
 # Set page configuration
 st.set_page_config(
     page_title="LLMS.txt Generator",
@@ -41,96 +62,303 @@ st.markdown("""
 <style>
     .main .block-container {padding-top: 2rem; padding-bottom: 2rem;}
     .stProgress > div > div > div {background-color: #1565C0;}
-    .download-btn {
-        background-color: #1565C0;
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 0.3rem;
-        text-decoration: none;
-        font-weight: bold;
-        display: inline-block;
-        margin-top: 1rem;
-    }
-    .download-btn:hover {background-color: #0D47A1;}
-    .download-btn {color: white !important;}
     footer {visibility: hidden;}
 </style>
 """, unsafe_allow_html=True)
 
-def extract_urls_from_sitemap(sitemap_url, processed_sitemaps=None):
-    """Extract URLs from an XML sitemap, including sitemap indexes."""
+def build_model_options():
+    """Build the LLM model selectbox labels and the model identifiers they map to."""
+    # Add categorized models
+    model_options = []
+    model_values = []
+    for provider, models in CATEGORIZED_LLM_MODELS.items():
+        for model in models:
+            model_options.append(f"{provider}: {get_model_display_name(model)}")
+            model_values.append(model)
+
+    # Add custom model option
+    model_options.append("Custom Model")
+    model_values.append("custom")
+    return model_options, model_values
+
+# Built once at import instead of on every Streamlit rerun
+MODEL_OPTIONS, MODEL_VALUES = build_model_options()
+MODEL_VALUE_BY_OPTION = dict(zip(MODEL_OPTIONS, MODEL_VALUES))
+DEFAULT_MODEL_INDEX = MODEL_VALUES.index(DEFAULT_MODEL) if DEFAULT_MODEL in MODEL_VALUES else 0
+
+# Static sidebar content, rendered as a few markdown blocks instead of one element per line
+SIDEBAR_INTRO_MARKDOWN = """
+## LLMS.txt Generator
+This tool generates an `llms.txt` file according to the
+[AnswerDotAI specification](https://github.com/AnswerDotAI/llms-txt).
+
+### 🚀 New Features
+- **JavaScript Rendering**: Use Puppeteer to render dynamic content
+- **AI Descriptions**: Generate intelligent descriptions using OpenRouter
+- **Main Content Extraction**: Focus on primary content, exclude headers/footers
+- **Enhanced Processing**: Better handling of modern web pages
+
+### Benefits of llms.txt
+- 🤖 Helps AI models understand your website
+- 📚 Organizes your content for better discoverability
+- 🔍 Improves responses from AI assistants about your content
+- 🚀 Future-proofs your website for AI interactions
+
+### Setup Guide
+"""
+
+SIDEBAR_SETUP_MARKDOWN = """
+1. Visit [OpenRouter](https://openrouter.ai/keys)
+2. Create an account and get your API key
+3. Enter the key in the AI configuration section
+4. Choose your preferred model
+5. Enable AI descriptions for better results
+"""
+
+SIDEBAR_RESOURCES_MARKDOWN = """
+### Resources
+- [Official llms.txt Specification](https://llmstxt.org/)
+- [AnswerDotAI Repository](https://github.com/AnswerDotAI/llms-txt)
+- [OpenRouter API](https://openrouter.ai/)
+
+---
+"""
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+GZIP_MAGIC = b"\x1f\x8b"
+
+def iter_sitemap_locs(source):
+    """Stream <loc> entries out of a sitemap or sitemap index.
+
+    Entries are cleared as soon as they are read, so memory stays flat
+    regardless of sitemap size.
+
+    Args:
+        source: File-like object with the sitemap XML
+
+    Yields:
+        Tuples of (is_child_sitemap, loc)
+    """
+    for _, elem in etree.iterparse(
+        source,
+        events=("end",),
+        tag=(f"{SITEMAP_NS}url", f"{SITEMAP_NS}sitemap"),
+        resolve_entities=False
+    ):
+        loc = elem.findtext(f"{SITEMAP_NS}loc")
+        if loc and loc.strip():
+            yield elem.tag == f"{SITEMAP_NS}sitemap", loc.strip()
+        # Drop the parsed entry and any siblings already handled
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+def is_gzipped_sitemap(source):
+    """Tell whether a buffered sitemap body is a gzip file that still needs decompressing.
+
+    Checks the gzip magic bytes rather than the .gz suffix or Content-Type, since
+    servers often decompress .gz sitemaps on the fly or label plain XML as gzip.
+    """
+    return source.peek(2)[:2] == GZIP_MAGIC
+
+def fetch_sitemap_entries(sitemap_url):
+    """Fetch one sitemap and split its entries into page URLs and child sitemaps.
+
+    Args:
+        sitemap_url: URL of the sitemap or sitemap index
+
+    Returns:
+        Tuple of (page_urls, child_sitemap_urls)
+    """
+    urls = []
+    child_sitemaps = []
+
+    # Parse straight off the socket instead of buffering the whole document
+    with SESSION.get(sitemap_url, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # urllib3 undoes any gzip Content-Encoding
+        # Buffered so the magic bytes can be peeked; the with block closes the body instead
+        # of urllib3 closing it at EOF, which a BufferedReader would read as an error
+        response.raw.auto_close = False
+        source = io.BufferedReader(response.raw)
+        if is_gzipped_sitemap(source):
+            # sitemap.xml.gz files are gzip payloads, not gzip transfer encoding
+            source = gzip.GzipFile(fileobj=source)
+        for is_child_sitemap, loc in iter_sitemap_locs(source):
+            if is_child_sitemap:
+                child_sitemaps.append(loc)
+            else:
+                urls.append(loc)
+
+    return urls, child_sitemaps
+
+def collect_urls_from_sitemap(sitemap_url, processed_sitemaps=None):
+    """Extract URLs from an XML sitemap, including sitemap indexes.
+
+    Child sitemaps are fetched concurrently one index level at a time, then
+    stitched together depth-first so URLs keep their sitemap order. No
+    Streamlit calls are made here, so the result can be cached.
+
+    Returns:
+        Tuple of (urls, messages) where messages are (level, text) pairs
+    """
     if processed_sitemaps is None:
         processed_sitemaps = set()
     
     if sitemap_url in processed_sitemaps:
-        return []
+        return [], []
     
     processed_sitemaps.add(sitemap_url)
-    
-    try:
-        response = requests.get(sitemap_url, timeout=10)
-        response.raise_for_status()
-        
-        # Check if it's a sitemap index
-        root = ET.fromstring(response.content)
-        
-        # Define namespace map
-        ns_map = {
-            "sm": "http://www.sitemaps.org/schemas/sitemap/0.9"
-        }
-        
-        urls = []
-        
-        # Check if this is a sitemap index
-        if root.tag.endswith('sitemapindex'):
-            st.info(f"Processing sitemap index: {sitemap_url}")
-            for sitemap in root.findall('.//sm:sitemap', ns_map):
-                loc = sitemap.find('./sm:loc', ns_map)
-                if loc is not None and loc.text:
-                    # Recursively process each sitemap
-                    child_urls = extract_urls_from_sitemap(loc.text, processed_sitemaps)
-                    urls.extend(child_urls)
-        else:
-            # Regular sitemap
-            for url in root.findall('.//sm:url', ns_map):
-                loc = url.find('./sm:loc', ns_map)
-                if loc is not None and loc.text:
-                    urls.append(loc.text)
-        
-        return urls
-    except Exception as e:
-        st.error(f"Error processing sitemap {sitemap_url}: {str(e)}")
-        return []
+    messages = []
+
+    entries = {}
+    pending = [sitemap_url]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SITEMAP_MAX_WORKERS) as executor:
+        while pending:
+            futures = [(url, executor.submit(fetch_sitemap_entries, url)) for url in pending]
+            pending = []
+            for url, future in futures:
+                try:
+                    entries[url] = future.result()
+                except Exception as e:
+                    messages.append(("error", f"Error processing sitemap {url}: {str(e)}"))
+                    entries[url] = ([], [])
+                    continue
 
-def extract_urls_from_csv(csv_file):
-    """Extract URLs from a CSV file."""
+                child_sitemaps = entries[url][1]
+                if child_sitemaps:
+                    messages.append(("info", f"Processing sitemap index: {url}"))
+                for child_sitemap in child_sitemaps:
+                    if child_sitemap not in processed_sitemaps:
+                        processed_sitemaps.add(child_sitemap)
+                        pending.append(child_sitemap)
+
+    urls = []
+    stack = [sitemap_url]
+    assembled = set()
+    while stack:
+        current = stack.pop()
+        if current in assembled:
+            continue
+        assembled.add(current)
+        page_urls, child_sitemaps = entries[current]
+        urls.extend(page_urls)
+        # Reversed so the first child is expanded next, matching the recursive order
+        stack.extend(child for child in reversed(child_sitemaps) if child in entries)
+
+    return urls, messages
+
+def show_messages(messages):
+    """Render (level, text) messages returned by the URL collectors."""
+    for level, text in messages:
+        getattr(st, level)(text)
+
+def extract_urls_from_sitemap(sitemap_url, processed_sitemaps=None):
+    """Extract URLs from an XML sitemap, showing any errors in the app."""
+    urls, messages = collect_urls_from_sitemap(sitemap_url, processed_sitemaps)
+    show_messages(messages)
+    return urls
+
+URL_COLUMN_RE = re.compile(r'url|link|href|path', re.IGNORECASE)
+
+def filter_url_series(series):
+    """Return the stripped http(s) URLs in a pandas Series, using vectorized string ops."""
+    urls = series.dropna().astype("string[pyarrow]").str.strip()
+    # Arrow's starts_with kernel takes a single prefix, so OR the two masks
+    mask = urls.str.startswith('http://') | urls.str.startswith('https://')
+    return urls[mask].tolist()
+
+def read_csv_column(csv_file, column):
+    """Read a single CSV column as Arrow-backed strings using the pyarrow engine."""
+    return pd.read_csv(
+        csv_file, usecols=[column], engine='pyarrow', dtype='string[pyarrow]'
+    )[column]
+
+def collect_urls_from_csv(csv_file):
+    """Extract URLs from a CSV file without touching Streamlit, so it can be cached.
+
+    Returns:
+        Tuple of (urls, messages) where messages are (level, text) pairs
+    """
     try:
-        df = pd.read_csv(csv_file)
+        # Read just the header first so only the URL column gets parsed
+        columns = pd.read_csv(csv_file, nrows=0).columns
+        csv_file.seek(0)
         
         # Try to find URL columns
-        possible_url_columns = [col for col in df.columns if any(url_key in col.lower() for url_key in ['url', 'link', 'href', 'path'])]
+        possible_url_columns = [col for col in columns if URL_COLUMN_RE.search(str(col))]
         
         if possible_url_columns:
             # Use the first URL-like column
             url_column = possible_url_columns[0]
-            urls = df[url_column].tolist()
-            # Filter out non-URLs and NaN values
-            urls = [url for url in urls if isinstance(url, str) and url.strip().startswith(('http://', 'https://'))]
-            return urls
+            return filter_url_series(read_csv_column(csv_file, url_column)), []
         else:
             # Try first column as fallback
-            first_col = df.iloc[:, 0]
-            urls = first_col.tolist()
-            # Filter out non-URLs and NaN values
-            urls = [url for url in urls if isinstance(url, str) and url.strip().startswith(('http://', 'https://'))]
+            urls = filter_url_series(read_csv_column(csv_file, columns[0]))
             if urls:
-                return urls
+                return urls, []
             else:
-                st.warning("No URL column identified in the CSV file.")
-                return []
+                return [], [("warning", "No URL column identified in the CSV file.")]
     except Exception as e:
-        st.error(f"Error processing CSV: {str(e)}")
-        return []
+        return [], [("error", f"Error processing CSV: {str(e)}")]
+
+def extract_urls_from_csv(csv_file):
+    """Extract URLs from a CSV file, showing any errors in the app."""
+    urls, messages = collect_urls_from_csv(csv_file)
+    show_messages(messages)
+    return urls
+
+class URLListError(Exception):
+    """Raised by the cached URL loaders when nothing could be collected because of errors.
+
+    st.cache_data doesn't cache exceptions, so a failed fetch is retried on the next
+    attempt while partial results (some URLs plus errors) stay cached.
+    """
+
+    def __init__(self, messages):
+        super().__init__("; ".join(text for _, text in messages))
+        self.messages = messages
+
+def raise_on_total_failure(urls, messages):
+    """Return (urls, messages), raising URLListError if errors left no URLs at all."""
+    if not urls and any(level == "error" for level, _ in messages):
+        raise URLListError(messages)
+    return urls, messages
+
+@st.cache_data(ttl=URL_LIST_CACHE_TTL, show_spinner=False)
+def load_sitemap_urls(sitemap_url):
+    """Cached sitemap extraction, so reruns and repeat generations skip the fetch."""
+    return raise_on_total_failure(*collect_urls_from_sitemap(sitemap_url))
+
+@st.cache_data(ttl=URL_LIST_CACHE_TTL, show_spinner=False)
+def load_csv_urls(csv_bytes):
+    """Cached CSV extraction keyed on the uploaded file's bytes."""
+    return raise_on_total_failure(*collect_urls_from_csv(io.BytesIO(csv_bytes)))
+
+def _fallback_description(description, main_content):
+    """Fill in a missing description from the page's main content.
+
+    Args:
+        description: LLM or meta description, possibly empty
+        main_content: Extracted main content of the page
+
+    Returns:
+        The description, the first sentence of the content, or a generic placeholder
+    """
+    # Fallback to first paragraph if no description
+    if not description and main_content:
+        # Extract first meaningful sentence from main content
+        sentences = main_content.split('. ')
+        if sentences:
+            description = sentences[0]
+            if len(description) > 150:
+                description = description[:147] + "..."
+
+    # Final fallback
+    if not description:
+        description = "Resource information"
+
+    return description
 
 def get_page_content_enhanced(url, use_puppeteer=False, use_llm=False, llm_model=DEFAULT_MODEL, api_key=None):
     """Enhanced content extraction with Puppeteer and LLM integration.
@@ -164,39 +392,22 @@ def get_page_content_enhanced(url, use_puppeteer=False, use_llm=False, llm_model
         else:
             description = meta_desc
 
-        # Fallback to first paragraph if no description
-        if not description and main_content:
-            # Extract first meaningful sentence from main content
-            sentences = main_content.split('. ')
-            if sentences:
-                description = sentences[0]
-                if len(description) > 150:
-                    description = description[:147] + "..."
-
-        # Final fallback
-        if not description:
-            description = "Resource information"
-
-        return title, description, main_content
+        return title, _fallback_description(description, main_content), main_content
 
     except Exception as e:
         logging.error(f"Error in enhanced content extraction for {url}: {str(e)}")
         return f"Page at {url.split('/')[-1]}", "Resource information", ""
 
-def get_page_content(url):
-    """Legacy function for backward compatibility."""
-    title, _, _ = get_page_content_enhanced(url, use_puppeteer=False, use_llm=False)
-    return ""  # Return empty string to maintain compatibility
-
 def extract_title_and_description(html_content, url=""):
-    """Legacy function for backward compatibility."""
+    """Legacy function for backward compatibility. Parses the given HTML only, never fetches."""
     if not html_content:
-        # Use enhanced extraction as fallback
-        title, description, _ = get_page_content_enhanced(url, use_puppeteer=False, use_llm=False)
-        return title, description
+        return "", ""
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Only the tags read below are built into the tree
+        soup = BeautifulSoup(
+            html_content, HTML_PARSER, parse_only=SoupStrainer(['title', 'meta', 'p'])
+        )
 
         # Get title
         title = soup.title.string if soup.title else ""
@@ -204,11 +415,12 @@ def extract_title_and_description(html_content, url=""):
 
         # If no title found, use the last part of the URL
         if not title and url:
-            path = urlparse(url).path
-            title = path.strip('/').split('/')[-1].replace('-', ' ').replace('_', ' ').title()
+            parsed_url = urlparse(url)
+            last_segment = parsed_url.path.strip('/').split('/')[-1]
+            title = last_segment.replace('-', ' ').replace('_', ' ').title()
             # If still empty, use domain name
             if not title:
-                title = urlparse(url).netloc
+                title = parsed_url.netloc
 
         # Get meta description
         description = ""
@@ -229,6 +441,32 @@ def extract_title_and_description(html_content, url=""):
     except Exception:
         return f"Page at {url.split('/')[-1]}", "Resource information"
 
+@lru_cache(maxsize=32)
+def _compile_category_matcher(category_items):
+    """Compile category keywords into one regex that reports the first matching category.
+
+    Each category becomes a lookahead alternative with its own capture group, tried in
+    category order, so `match.lastindex` identifies the first category with any keyword
+    anywhere in the URL - the same "first match wins" rule as checking categories in turn.
+
+    Args:
+        category_items: Tuple of (category, keywords tuple) pairs in priority order
+
+    Returns:
+        Tuple of (compiled pattern or None, list of categories by group number)
+    """
+    categories = []
+    alternatives = []
+    for category, keywords in category_items:
+        if category == "Other" or not keywords: # "Other" is the fallback, never matched on
+            continue
+        categories.append(category)
+        alternatives.append("(?=.*?(" + "|".join(re.escape(kw) for kw in keywords) + "))")
+
+    if not alternatives:
+        return None, categories
+    return re.compile("(?:" + "|".join(alternatives) + ")", re.DOTALL), categories
+
 def categorize_urls(urls, category_keywords):
     """Categorize URLs into sections based on keywords in their path or full URL.
 
@@ -247,26 +485,19 @@ def categorize_urls(urls, category_keywords):
     if "Other" not in categorized:
         categorized["Other"] = []
 
-    url_lower_map = {url: url.lower() for url in urls} # Pre-lower case for efficiency
+    # Keywords in category_keywords are assumed to be lowercase already
+    matcher, matcher_categories = _compile_category_matcher(tuple(
+        (category, tuple(keywords)) for category, keywords in category_keywords.items()
+    ))
 
+    other_urls = categorized["Other"]
     for url in urls:
-        matched = False
-        url_low = url_lower_map[url]
-        path_low = urlparse(url).path.lower()
-        
-        for category, keywords in category_keywords.items():
-            if category == "Other": # Skip "Other" during keyword matching pass
-                continue
-
-            # Keywords in category_keywords are assumed to be lowercase already
-            if any(kw in url_low for kw in keywords) or \
-               any(kw in path_low for kw in keywords):
-                categorized[category].append(url)
-                matched = True
-                break  # First match wins
-
-        if not matched:
-            categorized["Other"].append(url)
+        # The path is part of the URL, so one scan of the lowercased URL covers both
+        match = matcher.match(url.lower()) if matcher else None
+        if match:
+            categorized[matcher_categories[match.lastindex - 1]].append(url)
+        else:
+            other_urls.append(url)
 
     # Remove empty categories from the final output, except "Other" if it's also empty.
     # Or, keep all defined categories even if empty, for consistency in llms.txt structure.
@@ -274,6 +505,73 @@ def categorize_urls(urls, category_keywords):
     return {k: v for k, v in categorized.items() if v or k in category_keywords}
 
 
+# Shared pool for concurrent .md HEAD probes, separate from the page workers that call find_md_link
+_md_probe_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="md-probe"
+)
+
+# Sites tend to mirror either all pages as .md or none, so hosts that keep missing stop being
+# probed; the tally expires so a host gets another chance later (e.g. after adding .md mirrors)
+_md_host_stats = TTLCache(maxsize=1024, ttl=MD_PROBE_HOST_STATS_TTL)
+_md_link_cache = LRUCache(maxsize=4096)  # Candidate URL -> confirmed .md URL (hits only)
+_md_probe_lock = threading.Lock()
+
+def _probe_md_url(md_url_to_check: str) -> Tuple[Optional[str], bool]:
+    """HEAD a candidate .md URL and return it (after redirects) if it exists.
+
+    Returns:
+        Tuple of (.md URL or None, whether the answer is conclusive). Timeouts and
+        connection errors are inconclusive, so they don't count as a miss for the host.
+    """
+    with _md_probe_lock:
+        cached = _md_link_cache.get(md_url_to_check)
+    if cached:
+        return cached, True
+    try:
+        with host_slot(md_url_to_check):
+            head_response = PROBE_SESSION.head( # Short timeout
+                md_url_to_check, timeout=2.5, allow_redirects=True
+            )
+        # Allow redirects because site might redirect /feature to /feature.md or vice-versa
+        if head_response.status_code == 200:
+            # Check if the final URL after redirects actually ends with .md
+            if urlparse(head_response.url).path.endswith(".md"):
+                with _md_probe_lock:
+                    _md_link_cache[md_url_to_check] = head_response.url
+                return head_response.url, True # The potentially redirected URL if it's the .md one
+    except requests.exceptions.Timeout:
+        logging.warning(f"Timeout checking for .md link: {md_url_to_check}")
+        return None, False
+    except requests.exceptions.ConnectionError:
+        return None, False
+    except requests.exceptions.RequestException:
+        pass # Silently ignore other errors (too many redirects, etc.)
+    return None, True
+
+def _first_md_link(md_urls_to_check):
+    """Probe candidate .md URLs at once and return the highest-priority one that exists.
+
+    Returns as soon as a candidate succeeds and every candidate ranked above it has
+    already failed, instead of waiting for slower lower-priority probes.
+
+    Returns:
+        Tuple of (.md URL or None, whether every probe that decided it was conclusive)
+    """
+    futures = [_md_probe_executor.submit(_probe_md_url, md_url) for md_url in md_urls_to_check]
+    pending = set(futures)
+    while pending:
+        _, pending = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in futures:
+            if not future.done():
+                break
+            if future.result()[0]:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+    return None, all(future.result()[1] for future in futures)
+
 def find_md_link(url: str) -> Optional[str]:
     """
     Checks for a corresponding .md file for a given URL by trying common patterns.
@@ -288,8 +586,15 @@ def find_md_link(url: str) -> Optional[str]:
     parsed_url = urlparse(url)
     path = parsed_url.path
     base_url_for_md = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    with _md_probe_lock:
+        stats = _md_host_stats.get(parsed_url.netloc)
+        if stats is None:
+            stats = _md_host_stats[parsed_url.netloc] = {"tries": 0, "hits": 0}
+        if stats["tries"] >= MD_PROBE_HOST_GIVE_UP and stats["hits"] == 0:
+            return None
     
-    potential_md_paths = set()
+    potential_md_paths = []
 
     # Common web extensions to replace
     extensions_to_replace = ['.html', '.htm', '.php', '.aspx', '.asp']
@@ -299,40 +604,40 @@ def find_md_link(url: str) -> Optional[str]:
     # Case 1: URL ends with a common web extension
     for ext in extensions_to_replace:
         if current_path_segment.endswith(ext):
-            potential_md_paths.add(current_path_segment[:-len(ext)] + ".md")
+            potential_md_paths.append(current_path_segment[:-len(ext)] + ".md")
             break
     else: # No common extension found, or after stripping extension
         # Case 2: URL ends with a slash (directory-like)
         if current_path_segment.endswith('/'):
             # e.g., /docs/feature/ -> /docs/feature.md
-            potential_md_paths.add(current_path_segment[:-1] + ".md")
+            potential_md_paths.append(current_path_segment[:-1] + ".md")
             # e.g., /docs/feature/ -> /docs/feature/feature.md (less common for .md but possible)
             # Only add if path has at least one segment before trailing slash
             parent_dir_name = current_path_segment.strip('/').split('/')[-1]
             if parent_dir_name:
-                 potential_md_paths.add(current_path_segment + parent_dir_name + ".md")
+                 potential_md_paths.append(current_path_segment + parent_dir_name + ".md")
         # Case 3: URL does not end with slash and no common extension (e.g. /docs/feature)
         else:
-            potential_md_paths.add(current_path_segment + ".md")
+            potential_md_paths.append(current_path_segment + ".md")
 
     # Construct full URLs and test them
-    for md_path in potential_md_paths:
-        if not md_path: continue
-        # Ensure path starts with a slash
-        md_url_to_check = base_url_for_md + (md_path if md_path.startswith('/') else '/' + md_path)
-        try:
-            head_response = requests.head(md_url_to_check, timeout=2.5, allow_redirects=True) # Short timeout
-            # Allow redirects because site might redirect /feature to /feature.md or vice-versa
-            if head_response.status_code == 200:
-                # Check if the final URL after redirects actually ends with .md
-                if urlparse(head_response.url).path.endswith(".md"):
-                    return head_response.url # Return the potentially redirected URL if it's the .md one
-        except requests.exceptions.Timeout:
-            logging.warning(f"Timeout checking for .md link: {md_url_to_check}")
-        except requests.exceptions.RequestException:
-            pass # Silently ignore other errors (connection, too many redirects, etc.)
+    md_urls_to_check = [
+        base_url_for_md + (md_path if md_path.startswith('/') else '/' + md_path)
+        for md_path in potential_md_paths if md_path
+    ]
+    if len(md_urls_to_check) == 1:
+        md_link, conclusive = _probe_md_url(md_urls_to_check[0])
+    else:
+        md_link, conclusive = _first_md_link(md_urls_to_check)
 
-    return None
+    with _md_probe_lock:
+        # A timeout or unreachable host says nothing about whether the site has .md mirrors
+        if md_link or conclusive:
+            stats["tries"] += 1
+        if md_link:
+            stats["hits"] += 1
+
+    return md_link
 
 
 def process_url(url, default_desc="Resource", use_puppeteer=False, use_llm=False, llm_model=DEFAULT_MODEL, api_key=None, check_for_md=False):
@@ -368,79 +673,209 @@ def process_url(url, default_desc="Resource", use_puppeteer=False, use_llm=False
         logging.error(f"Error processing URL {url}: {str(e)}")
         return url.split('/')[-1], default_desc, url, None
 
-def batch_process_urls(urls, category_desc="Resource", max_workers=5, use_puppeteer=False, use_llm=False, llm_model=DEFAULT_MODEL, api_key=None, check_for_md_for_category=False):
-    """Process multiple URLs in parallel with enhanced features.
+def extract_page_for_batch(url, use_puppeteer=False, check_for_md=False):
+    """Extract a page's content without describing it, for batched LLM descriptions.
 
     Args:
-        urls: List of URLs to process
-        category_desc: Default description for the category
-        max_workers: Maximum number of concurrent workers
+        url: The URL to process
         use_puppeteer: Whether to use Puppeteer for JavaScript rendering
-        use_llm: Whether to use LLM for description generation
+        check_for_md: Boolean flag to attempt .md link discovery
+
+    Returns:
+        Tuple of (title, meta_description, main_content, md_link)
+    """
+    try:
+        title, meta_desc, main_content = extract_content_sync(url, use_puppeteer)
+    except Exception as e:
+        logging.error(f"Error in enhanced content extraction for {url}: {str(e)}")
+        title, meta_desc, main_content = f"Page at {url.split('/')[-1]}", "", ""
+
+    md_link = find_md_link(url) if check_for_md else None
+    return title, meta_desc, main_content, md_link
+
+def describe_extracted_pages(extracted, llm_model=DEFAULT_MODEL, api_key=None):
+    """Generate LLM descriptions for already-extracted pages in as few requests as possible.
+
+    Args:
+        extracted: List of (url, default_desc, (title, meta_description, main_content, md_link))
         llm_model: The LLM model to use
         api_key: OpenRouter API key
-        check_for_md_for_category: Boolean flag to attempt .md link discovery for this batch
 
     Returns:
-        List of tuples (title, description, url, md_link)
+        List of tuples (title, description, url, md_link), in the order of `extracted`
     """
+    pages = {}
+    for url, _, (title, _, main_content, _) in extracted:
+        if url not in pages and len(main_content) >= MIN_CONTENT_LENGTH:
+            pages[url] = {"url": url, "title": title, "content": main_content}
+    llm_descriptions = {}
+    if pages:
+        llm_descriptions = generate_descriptions_batch_sync(
+            list(pages.values()), llm_model, api_key
+        )
+
     results = []
+    for url, default_desc, (title, meta_desc, main_content, md_link) in extracted:
+        desc = _fallback_description(llm_descriptions.get(url) or meta_desc, main_content)
+        title = title if title else url.split('/')[-1]
+        results.append((title, desc if desc else default_desc, url, md_link))
+    return results
 
+# Long-lived page worker pools, one per worker count, so threads survive across generations
+_page_executors = {}
+_page_executors_lock = threading.Lock()
+
+def _page_executor(max_workers):
+    """Return the shared page-processing pool with the given number of workers."""
+    with _page_executors_lock:
+        executor = _page_executors.get(max_workers)
+        if executor is None:
+            executor = _page_executors[max_workers] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="page-worker"
+            )
+    return executor
+
+def _failed_url_result(url, default_desc):
+    """Build the (title, description, url, md_link) entry for a URL whose processing raised."""
+    path = urlparse(url).path
+    filename = path.strip('/').split('/')[-1].replace('-', ' ').replace('_', ' ').title()
+    title = filename if filename else url.split('/')[-1]
+    return (title, default_desc, url, None) # No md_link in the error case
+
+def process_url_tasks(tasks, max_workers=MAX_WORKERS, use_puppeteer=False, use_llm=False,
+                      llm_model=DEFAULT_MODEL, api_key=None):
+    """Process URLs from any number of categories in one shared worker pool.
+
+    Args:
+        tasks: List of (url, default_desc, check_for_md) tuples
+        max_workers: Maximum number of concurrent workers
+        use_puppeteer: Whether to use Puppeteer for JavaScript rendering
+        use_llm: Whether to use LLM for description generation
+        llm_model: The LLM model to use
+        api_key: OpenRouter API key
+
+    Returns:
+        List of tuples (title, description, url, md_link), in the order of `tasks`
+    """
     actual_max_workers = max_workers
     # Reduce workers if using Puppeteer to avoid resource issues
     if use_puppeteer:
         actual_max_workers = min(actual_max_workers, 2) # Puppeteer is resource-intensive
-    # Reduce workers further if also checking for .md links to avoid too many outbound requests quickly
-    if check_for_md_for_category:
-        actual_max_workers = min(actual_max_workers, 3) # Max 3 workers if checking .md links
 
     # Ensure at least 1 worker
     actual_max_workers = max(1, actual_max_workers)
 
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=actual_max_workers) as executor:
-        future_to_url_map = {}
-        for u in urls: # Changed variable name to avoid conflict
-            future = executor.submit(
-                process_url,
-                u, # Current URL being processed
-                category_desc,
-                use_puppeteer,
-                use_llm,
-                llm_model,
-                api_key,
-                check_for_md_for_category # Pass the flag here
-            )
-            future_to_url_map[future] = u
-
-
-        for future in concurrent.futures.as_completed(future_to_url_map):
-            url_processed_item = future_to_url_map[future]
+    # With LLM descriptions, extract everything first and describe the pages in a few
+    # multi-page requests instead of one OpenRouter call per URL
+    if use_llm and api_key:
+        executor = _page_executor(actual_max_workers)
+        futures = [
+            executor.submit(extract_page_for_batch, url, use_puppeteer, check_for_md)
+            for url, _, check_for_md in tasks
+        ]
+        extracted = []
+        failed = {}
+        for index, ((url, default_desc, _), future) in enumerate(zip(tasks, futures)):
             try:
-                result_tuple = future.result() # This will be (title, desc, original_url, md_link)
-                results.append(result_tuple)
+                extracted.append((url, default_desc, future.result()))
             except Exception as e:
-                logging.error(f"Error processing URL {url_processed_item} in batch future: {str(e)}")
-                path = urlparse(url_processed_item).path
-                filename = path.strip('/').split('/')[-1].replace('-', ' ').replace('_', ' ').title()
-                title = filename if filename else url_processed_item.split('/')[-1]
-                results.append((title, category_desc, url_processed_item, None)) # Add None for md_link in error case
+                logging.error(f"Error processing URL {url} in batch future: {str(e)}")
+                failed[index] = _failed_url_result(url, default_desc)
+        described = iter(describe_extracted_pages(extracted, llm_model, api_key))
+        return [
+            failed[index] if index in failed else next(described)
+            for index in range(len(tasks))
+        ]
+
+    results = []
+    executor = _page_executor(actual_max_workers)
+    futures = [
+        executor.submit(
+            process_url, url, default_desc, use_puppeteer, use_llm, llm_model, api_key, check_for_md
+        )
+        for url, default_desc, check_for_md in tasks
+    ]
+
+    for (url, default_desc, _), future in zip(tasks, futures):
+        try:
+            results.append(future.result()) # This will be (title, desc, original_url, md_link)
+        except Exception as e:
+            logging.error(f"Error processing URL {url} in batch future: {str(e)}")
+            results.append(_failed_url_result(url, default_desc))
 
     return results
 
+def batch_process_urls(urls, category_desc="Resource", max_workers=MAX_WORKERS, use_puppeteer=False,
+                       use_llm=False, llm_model=DEFAULT_MODEL, api_key=None,
+                       check_for_md_for_category=False):
+    """Process multiple URLs in parallel with enhanced features.
+
+    Args:
+        urls: List of URLs to process
+        category_desc: Default description for the category
+        max_workers: Maximum number of concurrent workers
+        use_puppeteer: Whether to use Puppeteer for JavaScript rendering
+        use_llm: Whether to use LLM for description generation
+        llm_model: The LLM model to use
+        api_key: OpenRouter API key
+        check_for_md_for_category: Boolean flag to attempt .md link discovery for this batch
+
+    Returns:
+        List of tuples (title, description, url, md_link)
+    """
+    tasks = [(url, category_desc, check_for_md_for_category) for url in urls]
+    return process_url_tasks(tasks, max_workers, use_puppeteer, use_llm, llm_model, api_key)
+
+def batch_process_categories(categorized_urls_map, md_check_categories=(), max_workers=MAX_WORKERS,
+                             use_puppeteer=False, use_llm=False, llm_model=DEFAULT_MODEL,
+                             api_key=None):
+    """Process the URLs of every category together, so workers never idle at category boundaries.
+
+    Args:
+        categorized_urls_map: Dict of category title to list of URLs
+        md_check_categories: Categories whose URLs get .md link discovery
+        max_workers: Maximum number of concurrent workers
+        use_puppeteer: Whether to use Puppeteer for JavaScript rendering
+        use_llm: Whether to use LLM for description generation
+        llm_model: The LLM model to use
+        api_key: OpenRouter API key
+
+    Returns:
+        Dict of category title to list of tuples (title, description, url, md_link),
+        each in the category's URL order
+    """
+    tasks = []
+    task_categories = []
+    for category_title, category_urls in categorized_urls_map.items():
+        check_for_md = category_title in md_check_categories
+        for url in category_urls:
+            tasks.append((url, f"{category_title} resource", check_for_md))
+            task_categories.append(category_title)
+
+    results_by_category = {category_title: [] for category_title in categorized_urls_map}
+    results = process_url_tasks(tasks, max_workers, use_puppeteer, use_llm, llm_model, api_key)
+    for category_title, result in zip(task_categories, results):
+        results_by_category[category_title].append(result)
+    return results_by_category
+
+def derive_site_name(url):
+    """Derive a default site name from a URL's domain (e.g. docs.example.com -> Example)."""
+    domain = urlparse(url).netloc
+    parts = domain.split('.')
+    return parts[-2].capitalize() if len(parts) > 1 else domain
+
+WHITESPACE_RE = re.compile(r'\s+')
+
 def clean_description(desc):
     """Clean and format description text."""
     if not desc:
         return "Resource information"
     
     # Remove newlines and excessive spaces
-    desc = re.sub(r'\s+', ' ', desc).strip()
+    desc = WHITESPACE_RE.sub(' ', desc).strip()
     
     # Truncate if too long
-    if len(desc) > 150:
-        return desc[:147] + "..."
-    
-    return desc
+    return desc[:147] + "..." if len(desc) > 150 else desc
 
 def generate_llms_txt(urls, site_name, site_description, status_placeholder=None, use_puppeteer=False, use_llm=False, llm_model=DEFAULT_MODEL, api_key=None):
     """Generate the llms.txt content from a list of URLs with enhanced features.
@@ -461,6 +896,9 @@ def generate_llms_txt(urls, site_name, site_description, status_placeholder=None
     if not urls:
         return "No valid URLs provided."
 
+    # Each page is fetched and described once, however many spellings of it were supplied
+    urls = dedupe_urls(urls)
+
     # Generate status updates
     if status_placeholder:
         status_text = "Processing URLs"
@@ -471,23 +909,19 @@ def generate_llms_txt(urls, site_name, site_description, status_placeholder=None
         status_text += "..."
         status_placeholder.write(status_text)
 
-    # Get the base URL from the first URL
-    base_url = urlparse(urls[0]).netloc
-
-    # Add protocol if missing in site name
+    # Derive a site name from the first URL's domain if none was given
     if not site_name:
-        site_name = base_url.split('.')[-2].capitalize() if len(base_url.split('.')) > 1 else base_url
+        site_name = derive_site_name(urls[0])
 
     if not site_description:
         site_description = f"Information about {site_name}"
 
     # Start building the llms.txt content
-    content = []
+    buf = io.StringIO()
+    write = buf.write
 
     # Add header
-    content.append(f"# {site_name}")
-    content.append(f"> {site_description}")
-    content.append("")
+    write(f"# {site_name}\n> {site_description}\n\n")
 
     # Define default categories and keywords
     DEFAULT_CATEGORY_KEYWORDS = {
@@ -514,62 +948,53 @@ def generate_llms_txt(urls, site_name, site_description, status_placeholder=None
     total_processed_count = 0
     any_category_had_content = False
 
+    if status_placeholder:
+        status_placeholder.write(f"Processing {len(urls)} URLs across all sections...")
+
+    # All categories share one worker pool instead of running one batch after another
+    results_by_category = batch_process_categories(
+        categorized_urls_map,
+        MD_CHECK_CATEGORIES,
+        max_workers=MAX_WORKERS,
+        use_puppeteer=use_puppeteer,
+        use_llm=use_llm,
+        llm_model=llm_model,
+        api_key=api_key
+    )
+
+    # Computed once rather than rescanning every category when "Other" comes up
+    other_cats_have_content = any(
+        c_urls for c_title, c_urls in categorized_urls_map.items() if c_title != "Other"
+    )
+
     for category_title, category_urls in categorized_urls_map.items():
         if not category_urls:
-            # Special handling for "Other": only skip if it's empty AND other categories have/had content or will have content.
-            # If "Other" is the only category with items, it should be processed.
-            # If all categories are empty, nothing gets processed, which is fine.
-            if category_title == "Other":
-                is_other_empty = True
-                other_cats_have_content = False
-                for c_title, c_urls in categorized_urls_map.items():
-                    if c_title != "Other" and c_urls:
-                        other_cats_have_content = True
-                        break
-                if is_other_empty and other_cats_have_content:
-                    continue # Skip empty "Other" if other categories have content
-                elif is_other_empty and not other_cats_have_content and any_category_had_content: # Other is empty, no other cats have content now, but some previous cat had content
-                    continue
-
-            else: # For non-"Other" categories, if it's empty, just skip.
+            # Empty categories are skipped. An empty "Other" is only kept when no other
+            # category has URLs and nothing has been written yet.
+            if category_title != "Other" or other_cats_have_content or any_category_had_content:
                 continue
 
         current_category_has_entries = False
-        temp_category_content = [] # Store entries for current category temporarily
+        section_start = buf.tell() # Rolled back to if the section ends up empty
 
-        temp_category_content.append(f"## {category_title}")
-        temp_category_content.append("")
+        write(f"## {category_title}\n\n")
 
-        if status_placeholder:
-            status_placeholder.write(f"Processing {len(category_urls)} URLs for {category_title}...")
-
-        should_check_md_for_this_category = category_title in MD_CHECK_CATEGORIES
-
-        processed_category_items = batch_process_urls(
-            category_urls,
-            f"{category_title} resource",
-            max_workers=5,
-            use_puppeteer=use_puppeteer,
-            use_llm=use_llm,
-            llm_model=llm_model,
-            api_key=api_key,
-            check_for_md_for_category=should_check_md_for_this_category
-        )
-
-        for title, desc, url_processed, md_link in processed_category_items:
+        for title, desc, url_processed, md_link in results_by_category.get(category_title, []):
             entry = f"- [{title}]({url_processed}): {clean_description(desc)}"
             if md_link:
                 md_filename = md_link.split('/')[-1]
                 entry += f" ([{md_filename}]({md_link}))"
-            temp_category_content.append(entry)
+            write(entry + "\n")
             total_processed_count += 1
             current_category_has_entries = True
 
         if current_category_has_entries:
-            temp_category_content.append("") # Add a blank line after section's URLs
-            content.extend(temp_category_content)
+            write("\n") # Add a blank line after section's URLs
             any_category_had_content = True
-        # If no entries for this category, temp_category_content (header and blank line) is discarded.
+        else:
+            # If no entries for this category, drop its header and blank line
+            buf.seek(section_start)
+            buf.truncate()
 
 
     if total_processed_count == 0 and urls:
@@ -578,13 +1003,13 @@ def generate_llms_txt(urls, site_name, site_description, status_placeholder=None
         if status_placeholder:
             status_placeholder.write("Processing all URLs under General Information as fallback...")
 
-        content.append("## General Information")
-        content.append("")
+        section_start = buf.tell()
+        write("## General Information\n\n")
 
         processed_remaining_urls = batch_process_urls(
             urls,
             "Resource information",
-            max_workers=5,
+            max_workers=MAX_WORKERS,
             use_puppeteer=use_puppeteer,
             use_llm=use_llm,
             llm_model=llm_model,
@@ -593,19 +1018,20 @@ def generate_llms_txt(urls, site_name, site_description, status_placeholder=None
         )
         fallback_entries_added = False
         for title, desc, url_processed, md_link in processed_remaining_urls:
-            content.append(f"- [{title}]({url_processed}): {clean_description(desc)}")
+            write(f"- [{title}]({url_processed}): {clean_description(desc)}\n")
             fallback_entries_added = True
 
         if fallback_entries_added:
-            content.append("")
+            write("\n")
         else: # No entries for General Information either, remove its header
-            if content and content[-1] == "": content.pop()
-            if content and content[-1] == "## General Information": content.pop()
+            buf.seek(section_start)
+            buf.truncate()
 
 
-    # Remove the last empty line if it exists and content was actually added
-    if content and content[-1] == "" and total_processed_count > 0 :
-        content.pop()
+    # Remove the last empty line if content was actually added (every written section ends with one)
+    if total_processed_count > 0:
+        buf.seek(buf.tell() - 1)
+        buf.truncate()
 
     # Add generation info
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -615,96 +1041,91 @@ def generate_llms_txt(urls, site_name, site_description, status_placeholder=None
     if use_llm:
         generation_info += f" and AI descriptions ({llm_model})"
     generation_info += " -->"
-    content.append(generation_info)
+    write(generation_info)
+
+    return buf.getvalue()
+
+# LLM crawlers checked against robots.txt
+LLM_CRAWLERS = (
+    "AI2Bot",
+    "Ai2Bot-Dolma",
+    "Amazonbot",
+    "anthropic-ai",
+    "Applebot",
+    "Applebot-Extended",
+    "Brightbot 1.0",
+    "Bytespider",
+    "CCBot",
+    "ChatGPT-User",
+    "Claude-Web",
+    "ClaudeBot",
+    "cohere-ai",
+    "cohere-training-data-crawler",
+    "Crawlspace",
+    "Diffbot",
+    "DuckAssistBot",
+    "FacebookBot",
+    "FriendlyCrawler",
+    "Google-Extended",
+    "GoogleOther",
+    "GoogleOther-Image",
+    "GoogleOther-Video",
+    "GPTBot",
+    "iaskspider/2.0",
+    "ICC-Crawler",
+    "ImagesiftBot",
+    "img2dataset",
+    "ISSCyberRiskCrawler",
+    "Kangaroo Bot",
+    "Meta-ExternalAgent",
+    "Meta-ExternalFetcher",
+    "OAI-SearchBot",
+    "omgili",
+    "omgilibot",
+    "PanguBot",
+    "PerplexityBot",
+    "Perplexity‑User",
+    "PetalBot",
+    "Scrapy",
+    "SemrushBot-OCOB",
+    "SemrushBot-SWA",
+    "Sidetrade indexer bot",
+    "Timpibot",
+    "VelenPublicWebCrawler",
+    "Webzio-Extended",
+    "YouBot"
+)
 
-    return "\n".join(content)
+ROBOTS_USER_AGENT_RE = re.compile(r'^(\s*user-agent\s*:\s*)([^/#]*?)\s*/[^#]*', re.I)
 
-def get_download_link(content, filename="llms.txt"):
-    """Generate a download link for the text content."""
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}" class="download-btn">Download {filename}</a>'
-    return href
+def robots_product_token_lines(robots_txt):
+    """Split robots.txt into lines with versions cut from User-agent values.
+
+    RobotFileParser drops the "/version" from the agent it is asked about but not
+    from the agents named in the file, so "User-agent: iaskspider/2.0" would never
+    match. Both sides are compared on the product token instead.
+    """
+    return [ROBOTS_USER_AGENT_RE.sub(r'\1\2', line) for line in robots_txt.splitlines()]
 
 def check_llm_crawler_accessibility(domain):
-    """Check if various LLM crawlers are blocked in robots.txt."""
-    # List of LLM crawlers
-    llm_crawlers = [
-        "AI2Bot",
-        "Ai2Bot-Dolma",
-        "Amazonbot",
-        "anthropic-ai",
-        "Applebot",
-        "Applebot-Extended",
-        "Brightbot 1.0",
-        "Bytespider",
-        "CCBot",
-        "ChatGPT-User",
-        "Claude-Web",
-        "ClaudeBot",
-        "cohere-ai",
-        "cohere-training-data-crawler",
-        "Crawlspace",
-        "Diffbot",
-        "DuckAssistBot",
-        "FacebookBot",
-        "FriendlyCrawler",
-        "Google-Extended",
-        "GoogleOther",
-        "GoogleOther-Image",
-        "GoogleOther-Video",
-        "GPTBot",
-        "iaskspider/2.0",
-        "ICC-Crawler",
-        "ImagesiftBot",
-        "img2dataset",
-        "ISSCyberRiskCrawler",
-        "Kangaroo Bot",
-        "Meta-ExternalAgent",
-        "Meta-ExternalFetcher",
-        "OAI-SearchBot",
-        "omgili",
-        "omgilibot",
-        "PanguBot",
-        "PerplexityBot",
-        "Perplexity‑User",
-        "PetalBot",
-        "Scrapy",
-        "SemrushBot-OCOB",
-        "SemrushBot-SWA",
-        "Sidetrade indexer bot",
-        "Timpibot",
-        "VelenPublicWebCrawler",
-        "Webzio-Extended",
-        "YouBot"
-    ]
-    
+    """Check if various LLM crawlers are blocked in robots.txt.
+
+    robots.txt holds the rules for every user agent, so it is fetched once and
+    each crawler is matched against the parsed rules locally.
+    """
     blocked_crawlers = []
     
     # Check robots.txt
     try:
         robots_url = f"https://{domain}/robots.txt"
-        response = requests.get(robots_url, timeout=10)
+        response = SESSION.get(robots_url, timeout=10)
         if response.status_code == 200:
-            robots_content = response.text.split('\n')
-            current_user_agent = None
-            disallow_rules = []
-            
-            for line in robots_content:
-                line = line.strip()
-                if line.lower().startswith('user-agent:'):
-                    current_user_agent = line.split(':', 1)[1].strip()
-                    disallow_rules = []
-                elif line.lower().startswith('disallow:') and current_user_agent:
-                    disallow_rules.append(line.split(':', 1)[1].strip())
-                    
-                    # Check if this user agent matches any of our crawlers
-                    for crawler in llm_crawlers:
-                        if (current_user_agent == '*' or 
-                            crawler.lower() in current_user_agent.lower() or 
-                            current_user_agent.lower() in crawler.lower()):
-                            if any(rule == '/' for rule in disallow_rules):
-                                if crawler not in blocked_crawlers:
-                                    blocked_crawlers.append(crawler)
+            parser = RobotFileParser(robots_url)
+            parser.parse(robots_product_token_lines(response.text))
+            blocked_crawlers = [
+                crawler for crawler in LLM_CRAWLERS
+                if not parser.can_fetch(crawler, "/")
+            ]
     except Exception as e:
         st.error(f"Error checking robots.txt: {str(e)}")
     
@@ -745,26 +1166,9 @@ def main():
     with tab1:
         st.subheader("Generate LLMS.txt File")
 
-        # Main configuration
-        col1, col2 = st.columns([3, 2])
-
-        with col1:
-            st.subheader("Website Information")
-            site_name = st.text_input("Website Name", placeholder="My Website")
-            site_description = st.text_area("Website Description",
-                                           placeholder="A brief description of what your website is about",
-                                           height=100)
-
-        with col2:
-            st.subheader("URL Source")
-            input_type = st.radio("Select input type:", ["Sitemap URL", "CSV Upload"])
-
-            if input_type == "Sitemap URL":
-                sitemap_url = st.text_input("Sitemap URL", placeholder="https://example.com/sitemap.xml")
-                input_ready = sitemap_url.strip() != ""
-            else:
-                uploaded_file = st.file_uploader("Upload CSV with URLs", type=['csv'])
-                input_ready = uploaded_file is not None
+        # Widgets that show or hide other inputs stay outside the form so the
+        # layout updates immediately; everything else only commits on submit
+        input_type = st.radio("Select input type:", ["Sitemap URL", "CSV Upload"], horizontal=True)
 
         # Enhanced features section
         st.subheader("🚀 Enhanced Features")
@@ -789,48 +1193,19 @@ def main():
         if use_llm:
             st.markdown("**LLM Configuration**")
 
-            # API Key input
-            api_key = st.text_input(
-                "OpenRouter API Key",
-                type="password",
-                placeholder="sk-or-v1-...",
-                help="Get your API key from https://openrouter.ai/keys"
-            )
-
             # Model selection with categorized options
             col5, col6 = st.columns([2, 1])
 
             with col5:
-                # Create categorized options for the selectbox
-                model_options = []
-                model_values = []
-
-                # Add categorized models
-                for provider, models in CATEGORIZED_LLM_MODELS.items():
-                    for model in models:
-                        display_name = f"{provider}: {get_model_display_name(model)}"
-                        model_options.append(display_name)
-                        model_values.append(model)
-
-                # Add custom model option
-                model_options.append("Custom Model")
-                model_values.append("custom")
-
-                # Find default model index
-                default_index = 0
-                if DEFAULT_MODEL in model_values:
-                    default_index = model_values.index(DEFAULT_MODEL)
-
                 selected_model_display = st.selectbox(
                     "LLM Model",
-                    options=model_options,
-                    index=default_index,
+                    options=MODEL_OPTIONS,
+                    index=DEFAULT_MODEL_INDEX,
                     help="Choose the AI model for generating descriptions"
                 )
 
                 # Get the actual model value
-                selected_index = model_options.index(selected_model_display)
-                selected_model_value = model_values[selected_index]
+                selected_model_value = MODEL_VALUE_BY_OPTION[selected_model_display]
 
             with col6:
                 # Show model info
@@ -869,22 +1244,71 @@ def main():
             else:
                 llm_model = selected_model_value
 
-            if not api_key:
+        with st.form("generator"):
+            # Main configuration
+            col1, col2 = st.columns([3, 2])
+
+            with col1:
+                st.subheader("Website Information")
+                site_name = st.text_input("Website Name", placeholder="My Website")
+                site_description = st.text_area(
+                    "Website Description",
+                    placeholder="A brief description of what your website is about",
+                    height=100
+                )
+
+            with col2:
+                st.subheader("URL Source")
+                if input_type == "Sitemap URL":
+                    sitemap_url = st.text_input(
+                        "Sitemap URL", placeholder="https://example.com/sitemap.xml"
+                    )
+                else:
+                    uploaded_file = st.file_uploader("Upload CSV with URLs", type=['csv'])
+
+            api_key = None
+            if use_llm:
+                api_key = st.text_input(
+                    "OpenRouter API Key",
+                    type="password",
+                    placeholder="sk-or-v1-...",
+                    help="Get your API key from https://openrouter.ai/keys"
+                )
+
+            submitted = st.form_submit_button("Generate LLMS.txt", type="primary")
+
+        if submitted:
+            if input_type == "Sitemap URL":
+                input_ready = sitemap_url.strip() != ""
+            else:
+                input_ready = uploaded_file is not None
+            if not input_ready:
+                st.error("Please provide a sitemap URL or upload a CSV file.")
+
+            if use_llm and not api_key:
                 st.warning("⚠️ Please provide an OpenRouter API key to use AI-generated descriptions.")
                 use_llm = False
-        
-        # Set default values for LLM configuration if not using LLM
-        if not use_llm:
-            api_key = None
-            llm_model = DEFAULT_MODEL
 
-        if st.button("Generate LLMS.txt", disabled=not input_ready, type="primary"):
+            # Set default values for LLM configuration if not using LLM
+            if not use_llm:
+                api_key = None
+                llm_model = DEFAULT_MODEL
+
+        if submitted and input_ready:
+            # Drop the previous output so a failed run can't leave another site's file up
+            st.session_state.pop("generation", None)
             with st.spinner("Processing URLs..."):
                 # Extract URLs based on the selected input type
                 if input_type == "Sitemap URL":
-                    urls = extract_urls_from_sitemap(sitemap_url)
+                    loader, source = load_sitemap_urls, sitemap_url.strip()
                 else:
-                    urls = extract_urls_from_csv(uploaded_file)
+                    loader, source = load_csv_urls, uploaded_file.getvalue()
+                try:
+                    urls, messages = loader(source)
+                except URLListError as e:
+                    urls, messages = [], e.messages
+                show_messages(messages)
+                urls = dedupe_urls(urls)
 
                 if not urls:
                     st.error("No valid URLs found. Please check your input.")
@@ -893,8 +1317,7 @@ def main():
 
                     # Use default values if not provided
                     if not site_name:
-                        domain = urlparse(urls[0]).netloc
-                        site_name = domain.split('.')[-2].capitalize() if len(domain.split('.')) > 1 else domain
+                        site_name = derive_site_name(urls[0])
 
                     if not site_description:
                         site_description = f"Information about {site_name}"
@@ -925,38 +1348,55 @@ def main():
 
                     status_container.success("LLMS.txt generated successfully!")
 
-                    # Display the generated content
-                    st.subheader("Generated LLMS.txt")
-                    st.text_area("Content", llms_txt_content, height=400)
-
-                    # Provide download link
-                    st.markdown(get_download_link(llms_txt_content), unsafe_allow_html=True)
-
-                    # Usage instructions
-                    st.info("### How to use your llms.txt file\n\n"
-                           "1. Download the generated file\n"
-                           "2. Upload it to your website's root directory\n"
-                           "3. Make sure it's accessible at https://yourdomain.com/llms.txt\n"
-                           "4. Verify it with the [llms.txt validator](https://llmstxt.org/validator)")
-
-                    # Display enhanced stats
-                    st.subheader("Statistics")
-                    col_stats1, col_stats2, col_stats3 = st.columns(3)
-
-                    with col_stats1:
-                        st.metric("Total URLs", len(urls))
-
-                    with col_stats2:
-                        if use_puppeteer:
-                            st.metric("JavaScript Rendering", "✅ Enabled")
-                        else:
-                            st.metric("JavaScript Rendering", "❌ Disabled")
-
-                    with col_stats3:
-                        if use_llm and api_key:
-                            st.metric("AI Descriptions", "✅ Enabled")
-                        else:
-                            st.metric("AI Descriptions", "❌ Disabled")
+                    # Keep the result across reruns so toggling widgets afterwards neither
+                    # loses it nor requires another (possibly paid) generation run
+                    st.session_state["generation"] = {
+                        "content": llms_txt_content,
+                        "url_count": len(urls),
+                        "use_puppeteer": use_puppeteer,
+                        "use_llm": bool(use_llm and api_key)
+                    }
+
+        generation = st.session_state.get("generation")
+        if generation:
+            # Display the generated content
+            st.subheader("Generated LLMS.txt")
+            st.text_area("Content", generation["content"], height=400)
+
+            # Provide download button (served by Streamlit, no base64 data URI in the page)
+            st.download_button(
+                "Download llms.txt",
+                data=generation["content"],
+                file_name="llms.txt",
+                mime="text/plain",
+                type="primary"
+            )
+
+            # Usage instructions
+            st.info("### How to use your llms.txt file\n\n"
+                   "1. Download the generated file\n"
+                   "2. Upload it to your website's root directory\n"
+                   "3. Make sure it's accessible at https://yourdomain.com/llms.txt\n"
+                   "4. Verify it with the [llms.txt validator](https://llmstxt.org/validator)")
+
+            # Display enhanced stats
+            st.subheader("Statistics")
+            col_stats1, col_stats2, col_stats3 = st.columns(3)
+
+            with col_stats1:
+                st.metric("Total URLs", generation["url_count"])
+
+            with col_stats2:
+                if generation["use_puppeteer"]:
+                    st.metric("JavaScript Rendering", "✅ Enabled")
+                else:
+                    st.metric("JavaScript Rendering", "❌ Disabled")
+
+            with col_stats3:
+                if generation["use_llm"]:
+                    st.metric("AI Descriptions", "✅ Enabled")
+                else:
+                    st.metric("AI Descriptions", "❌ Disabled")
     
     with tab2:
         st.subheader("🔍 Check LLM Crawler Accessibility")
@@ -981,43 +1421,10 @@ def main():
 
     # Add sidebar with additional information
     with st.sidebar:
-        st.header("LLMS.txt Generator")
-        st.markdown("This tool generates an `llms.txt` file according to the [AnswerDotAI specification](https://github.com/AnswerDotAI/llms-txt).")
-
-        st.subheader("🚀 New Features")
-        st.markdown("""
-        - **JavaScript Rendering**: Use Puppeteer to render dynamic content
-        - **AI Descriptions**: Generate intelligent descriptions using OpenRouter
-        - **Main Content Extraction**: Focus on primary content, exclude headers/footers
-        - **Enhanced Processing**: Better handling of modern web pages
-        """)
-
-        st.subheader("Benefits of llms.txt")
-        st.markdown("""
-        - 🤖 Helps AI models understand your website
-        - 📚 Organizes your content for better discoverability
-        - 🔍 Improves responses from AI assistants about your content
-        - 🚀 Future-proofs your website for AI interactions
-        """)
-
-        st.subheader("Setup Guide")
+        st.markdown(SIDEBAR_INTRO_MARKDOWN)
         with st.expander("OpenRouter API Setup"):
-            st.markdown("""
-            1. Visit [OpenRouter](https://openrouter.ai/keys)
-            2. Create an account and get your API key
-            3. Enter the key in the AI configuration section
-            4. Choose your preferred model
-            5. Enable AI descriptions for better results
-            """)
-
-        st.subheader("Resources")
-        st.markdown("""
-        - [Official llms.txt Specification](https://llmstxt.org/)
-        - [AnswerDotAI Repository](https://github.com/AnswerDotAI/llms-txt)
-        - [OpenRouter API](https://openrouter.ai/)
-        """)
-
-        st.markdown("---")
+            st.markdown(SIDEBAR_SETUP_MARKDOWN)
+        st.markdown(SIDEBAR_RESOURCES_MARKDOWN)
         st.caption("© 2025 LLMS.txt Generator | Adnan Akram")
 
 if __name__ == "__main__":
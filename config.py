@@ -1,6 +1,7 @@
 """Configuration settings for the LLMS.txt Generator."""
 
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -9,6 +10,8 @@ load_dotenv()
 # OpenRouter API Configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_MAX_KEEPALIVE = 20  # Idle keep-alive connections kept open to OpenRouter
+OPENROUTER_SYNC_CLIENTS = 8  # OpenRouter clients (one per API key) kept open for the sync wrappers
 
 # Categorized LLM models available on OpenRouter
 CATEGORIZED_LLM_MODELS = {
@@ -61,19 +64,54 @@ DEFAULT_MODEL = "deepseek/deepseek-r1-0528:free"
 # Puppeteer Configuration
 PUPPETEER_TIMEOUT = 30000  # 30 seconds
 PUPPETEER_WAIT_UNTIL = "networkidle2"
+# Never needed for the page HTML
+PUPPETEER_BLOCKED_RESOURCE_TYPES = ("image", "font", "media", "stylesheet")
 
 # Content extraction settings
 MAX_CONTENT_LENGTH = 8000  # Maximum characters to send to LLM
 MIN_CONTENT_LENGTH = 100   # Minimum content length to process
+LLM_BATCH_SIZE = 10        # Pages described per OpenRouter request
+LLM_BATCH_CONTENT_LENGTH = 2000  # Characters of each page's content included in a batch prompt
+LLM_MAX_CONCURRENT_REQUESTS = 8  # OpenRouter requests in flight at once per batch call
+MAX_HTML_BYTES = 2 * 1024 * 1024  # Maximum bytes of HTML downloaded per page
+STREAM_CHUNK_SIZE = 64 * 1024     # Read size when streaming page bodies
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")  # Content-Types worth downloading
+HTML_PARSER = "lxml"              # BeautifulSoup parser (C-backed, much faster than html.parser)
+HTTP_CACHE_MAXSIZE = 1024         # Number of fetched pages kept for conditional revalidation
+HTTP_CACHE_TTL = 3600             # Seconds a cached page stays eligible for revalidation
+CONTENT_TYPE_CACHE_MAXSIZE = 4096  # URLs whose HEAD-probed Content-Type is remembered
+CONTENT_TYPE_CACHE_TTL = 3600     # Seconds a probed Content-Type is reused
+EXTRACTION_CACHE_MAXSIZE = 1024   # Extracted (title, description, content) results kept in memory
+EXTRACTION_CACHE_TTL = 600        # Seconds an extraction is reused without touching the network
+MAIN_CONTENT_CACHE_MAXSIZE = 1024  # Extracted main-content texts kept, keyed by page HTML hash
+# Worker processes parsing large pages in parallel (0 parses in-thread)
+EXTRACTION_PROCESSES = os.cpu_count() or 1
+# Smaller pages parse in the calling thread; IPC would cost more than it saves
+EXTRACTION_PROCESS_MIN_CHARS = 100_000
+DESCRIPTION_CACHE_MAXSIZE = 8192  # LLM descriptions kept in memory, keyed by model and page content
+# SQLite file persisting LLM descriptions across restarts (empty disables)
+DESCRIPTION_CACHE_PATH = os.getenv("DESCRIPTION_CACHE_PATH", "")
+DESCRIPTION_CACHE_TTL = 86400     # Seconds a persisted description is reused
 
 # Request settings
 REQUEST_TIMEOUT = 10
 MAX_RETRIES = 3
+HTTP_POOL_CONNECTIONS = 32  # Hosts kept in the shared session's connection pool
+HTTP_POOL_MAXSIZE = 64      # Keep-alive connections kept per host
+MAX_WORKERS = 10  # Concurrent page fetches when processing URLs (I/O bound, so threads scale)
+SITEMAP_MAX_WORKERS = 16  # Child sitemaps of a sitemap index fetched at once
+MAX_CONNECTIONS_PER_HOST = 8  # Concurrent page fetches/.md probes allowed against any one host
+MD_PROBE_HOST_GIVE_UP = 20  # Stop probing a host for .md links after this many URLs without a hit
+MD_PROBE_HOST_STATS_TTL = 600  # Seconds before a host's .md hit/miss tally resets
+URL_LIST_CACHE_TTL = 3600  # Seconds sitemap/CSV URL lists are reused across Streamlit reruns
 
 # User agent for web scraping
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
 # Model validation
+# Pattern: provider/model-name or provider/model-name:variant
+MODEL_NAME_RE = re.compile(r'^[a-zA-Z0-9_-]+/[a-zA-Z0-9._-]+(?::[a-zA-Z0-9._-]+)?$')
+
 def validate_custom_model(model_name: str) -> bool:
     """Validate custom model name format.
 
@@ -83,14 +121,21 @@ def validate_custom_model(model_name: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    import re
-
     if not model_name or not isinstance(model_name, str):
         return False
 
-    # Pattern: provider/model-name or provider/model-name:variant
-    pattern = r'^[a-zA-Z0-9_-]+/[a-zA-Z0-9._-]+(?::[a-zA-Z0-9._-]+)?$'
-    return bool(re.match(pattern, model_name.strip()))
+    return bool(MODEL_NAME_RE.match(model_name.strip()))
+
+def validate_custom_models(model_names) -> list:
+    """Validate several custom model names in one pass.
+
+    Args:
+        model_names: Iterable of model names to validate
+
+    Returns:
+        List of booleans, one per model name, in input order
+    """
+    return [validate_custom_model(name) for name in model_names]
 
 def get_model_display_name(model_name: str) -> str:
     """Get a user-friendly display name for a model.
@@ -1,24 +1,178 @@
 """Enhanced content extraction with Puppeteer and main content filtering."""
 
 import asyncio
+import concurrent.futures
+import hashlib
 import logging
+import multiprocessing
 import re
+import threading
 from typing import Optional, Tuple, Dict
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector
 from readability import Document
 import requests
+from cachetools import LRUCache, TTLCache
 from pyppeteer import launch
+from utils import create_session, host_slot, run_async
 from config import (
     PUPPETEER_TIMEOUT, 
     PUPPETEER_WAIT_UNTIL, 
+    PUPPETEER_BLOCKED_RESOURCE_TYPES,
     USER_AGENT, 
     REQUEST_TIMEOUT,
     MAX_CONTENT_LENGTH,
-    MIN_CONTENT_LENGTH
+    MIN_CONTENT_LENGTH,
+    MAX_HTML_BYTES,
+    STREAM_CHUNK_SIZE,
+    HTML_CONTENT_TYPES,
+    HTML_PARSER,
+    HTTP_CACHE_MAXSIZE,
+    HTTP_CACHE_TTL,
+    EXTRACTION_CACHE_MAXSIZE,
+    EXTRACTION_CACHE_TTL,
+    MAIN_CONTENT_CACHE_MAXSIZE,
+    EXTRACTION_PROCESSES,
+    EXTRACTION_PROCESS_MIN_CHARS
 )
 
 logger = logging.getLogger(__name__)
 
+UNWANTED_TAG_NAMES = [
+    'script', 'style', 'nav', 'header', 'footer',
+    'aside', 'advertisement', 'ads', 'sidebar',
+    'menu', 'breadcrumb', 'social', 'share', 'dialog',
+    'form', 'input', 'textarea', 'button', 'select', 'option',
+    'iframe', 'canvas', 'map', 'object', 'embed'
+]
+
+# Joined into a single selector so soupsieve walks the tree once
+UNWANTED_SELECTOR = ", ".join([
+    '[role="navigation"]', '[role="banner"]', '[role="contentinfo"]',
+    '[aria-modal="true"]', '[role="dialog"]', '[role="alert"]',
+    '.cookie', '#cookie', '.banner', '#banner', '.popup', '#popup',
+    '.modal', '#modal', '.dialog', '#dialog', '.gdpr', '.cc-banner',
+    '[class*="cookie"]', '[id*="cookie"]',
+    '[class*="banner"]', '[id*="banner"]',
+    '[class*="popup"]', '[id*="popup"]',
+    '[class*="modal"]', '[id*="modal"]',
+    '[class*="dialog"]', '[id*="dialog"]',
+    '[class*="consent"]', '[id*="consent"]',
+    '[class*="gdpr"]', '[id*="gdpr"]'
+])
+
+# Class/id words that mark boilerplate, unioned into one regex so each attribute takes one pass
+UNWANTED_CLASS_ID_PATTERNS = [
+    'nav', 'header', 'footer', 'sidebar', 'menu', 'masthead', 'bottom',
+    'advertisement', 'ads', 'social', 'share', 'rating', 'metadata',
+    'breadcrumb', 'pagination', 'related', 'comment', 'testimonial', 'author-bio',
+    'cookie', 'banner', 'popup', 'modal', 'dialog', 'consent', 'gdpr',
+    'widget', 'toolbar', 'utility-bar', 'skip-link', 'visually-hidden', 'sr-only',
+    'cookie-consent', 'privacy-popup'
+]
+UNWANTED_CLASS_ID_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(pattern) for pattern in UNWANTED_CLASS_ID_PATTERNS) + r')\b', re.I
+)
+WHITESPACE_RE = re.compile(r'\s+')
+# Inline styles that hide an element, however the declaration is spaced or cased
+HIDDEN_STYLE_RE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden', re.I)
+
+# Stripped before falling back to a page's raw text
+BASIC_UNWANTED_TAG_NAMES = ['script', 'style', 'nav', 'header', 'footer', 'aside']
+# Bodies that are clearly not HTML: JSON documents and PDFs
+NON_HTML_PREFIX_RE = re.compile(r'\s*(?:[{\[]|%PDF-)')
+
+TITLE_META_STRAINER = SoupStrainer(['title', 'meta'])
+HEAD_END_RE = re.compile(r'</head\s*>', re.I)
+
+def html_body_encoding(content_type: str, body: bytes) -> str:
+    """Pick the charset for decoding an HTML body.
+
+    A charset in the Content-Type header wins, then the document's own
+    <meta charset>, then UTF-8. requests' ISO-8859-1 default for charset-less
+    text/html and its chardet fallback are never used.
+
+    Args:
+        content_type: Lowercased Content-Type header value
+        body: Raw response bytes
+
+    Returns:
+        Encoding name
+    """
+    if "charset=" in content_type:
+        charset = content_type.split("charset=", 1)[1].split(";", 1)[0].strip(' "\'')
+        if charset:
+            return charset
+    # HTML requires <meta charset> within the first 1024 bytes; bs4 needs real bytes here
+    return EncodingDetector.find_declared_encoding(bytes(body[:4096]), is_html=True) or "utf-8"
+
+# Pooled keep-alive session shared by all page fetches, so same-host pages skip the TLS handshake
+SESSION = create_session()
+
+# Page bodies keyed by URL with their validators, shared by every extractor in the
+# process so Streamlit reruns can revalidate with a 304 instead of re-downloading
+_http_cache = TTLCache(maxsize=HTTP_CACHE_MAXSIZE, ttl=HTTP_CACHE_TTL)
+_http_cache_lock = threading.Lock()
+
+# Finished extractions keyed by (url, use_puppeteer), so reruns skip fetching and parsing
+_extraction_cache = TTLCache(maxsize=EXTRACTION_CACHE_MAXSIZE, ttl=EXTRACTION_CACHE_TTL)
+_extraction_cache_lock = threading.Lock()
+
+# Main content keyed by a hash of the HTML it came from, shared across URLs
+_main_content_cache = LRUCache(maxsize=MAIN_CONTENT_CACHE_MAXSIZE)
+_main_content_cache_lock = threading.Lock()
+
+# BeautifulSoup and readability hold the GIL, so large pages are parsed in worker
+# processes to use every core while the page threads keep fetching
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+_worker_extractor = None
+
+def _init_extraction_worker():
+    """Build the extractor each worker process reuses for every page it parses."""
+    global _worker_extractor
+    _worker_extractor = ContentExtractor()
+
+def _extract_main_content_worker(html_content: str) -> str:
+    """Uncached main content extraction, run inside an extraction worker process."""
+    return _worker_extractor._extract_main_content(html_content)
+
+def _get_extraction_pool():
+    """Return the shared extraction process pool, starting it on first use."""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            # spawn, not fork: forking a process full of fetch threads can copy held locks
+            _extraction_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=EXTRACTION_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_extraction_worker,
+            )
+        return _extraction_pool
+
+def _reset_extraction_pool(pool):
+    """Drop a broken extraction pool so the next large page starts a fresh one."""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is pool:
+            _extraction_pool = None
+    pool.shutdown(wait=False)
+
+async def _filter_puppeteer_request(request):
+    """Abort requests for resource types that never affect the rendered HTML."""
+    if request.resourceType in PUPPETEER_BLOCKED_RESOURCE_TYPES:
+        await request.abort()
+    else:
+        await request.continue_()
+
+def _basic_page_text(html_content: str) -> str:
+    """Visible text of a page with only scripts, styles and page chrome removed."""
+    soup = BeautifulSoup(html_content, HTML_PARSER)
+    for element in soup.find_all(BASIC_UNWANTED_TAG_NAMES):
+        element.decompose()
+    return WHITESPACE_RE.sub(' ', soup.get_text(separator=' ', strip=True)).strip()
+
 class ContentExtractor:
     """Enhanced content extractor with Puppeteer support and main content filtering."""
     
@@ -30,6 +184,9 @@ class ContentExtractor:
         """
         self.use_puppeteer = use_puppeteer
         self.browser = None
+        # Created on first Puppeteer use: on Python < 3.10 asyncio.Lock() binds to the
+        # current thread's event loop, which page-worker threads don't have
+        self._browser_lock = None
     
     async def get_page_content_puppeteer(self, url: str) -> str:
         """Fetch page content using Puppeteer for JavaScript rendering.
@@ -41,29 +198,51 @@ class ContentExtractor:
             HTML content as string
         """
         try:
-            if not self.browser:
-                self.browser = await launch(
-                    headless=True,
-                    args=['--no-sandbox', '--disable-setuid-sandbox']
+            if self._browser_lock is None:
+                # No await before the assignment, so callers on this loop can't race here
+                self._browser_lock = asyncio.Lock()
+            async with self._browser_lock:
+                if not self.browser:
+                    self.browser = await launch(
+                        headless=True,
+                        args=['--no-sandbox', '--disable-setuid-sandbox'],
+                        # Signal handlers can only be installed from the main thread;
+                        # autoClose still kills Chromium at interpreter exit
+                        handleSIGINT=False,
+                        handleSIGTERM=False,
+                        handleSIGHUP=False
+                    )
+
+            try:
+                page = await self.browser.newPage()
+            except Exception:
+                # The browser died; launch a fresh one on the next call
+                self.browser = None
+                raise
+            try:
+                await page.setUserAgent(USER_AGENT)
+                
+                # Set viewport
+                await page.setViewport({'width': 1920, 'height': 1080})
+
+                # Only the rendered HTML is read, so skip images, fonts, media and stylesheets
+                await page.setRequestInterception(True)
+                page.on(
+                    'request',
+                    lambda request: asyncio.ensure_future(_filter_puppeteer_request(request))
                 )
-            
-            page = await self.browser.newPage()
-            await page.setUserAgent(USER_AGENT)
-            
-            # Set viewport
-            await page.setViewport({'width': 1920, 'height': 1080})
-            
-            # Navigate to page and wait for content
-            await page.goto(url, {
-                'waitUntil': PUPPETEER_WAIT_UNTIL,
-                'timeout': PUPPETEER_TIMEOUT
-            })
-            
-            # Get the HTML content
-            content = await page.content()
-            await page.close()
-            
-            return content
+                
+                # Navigate to page and wait for content
+                await page.goto(url, {
+                    'waitUntil': PUPPETEER_WAIT_UNTIL,
+                    'timeout': PUPPETEER_TIMEOUT
+                })
+                
+                # Get the HTML content
+                return await page.content()
+            finally:
+                # Close even when navigation fails so pages don't pile up in the browser
+                await page.close()
             
         except Exception as e:
             logger.error(f"Error fetching content with Puppeteer for {url}: {str(e)}")
@@ -79,10 +258,48 @@ class ContentExtractor:
             HTML content as string
         """
         try:
-            headers = {"User-Agent": USER_AGENT}
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            return response.text
+            headers = {}  # User-Agent comes from the session
+            with _http_cache_lock:
+                cached = _http_cache.get(url)
+            if cached:
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+            # Stream the body so oversized pages never get buffered in full
+            with host_slot(url), SESSION.get(
+                url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True
+            ) as response:
+                if cached and response.status_code == 304:
+                    logger.info(f"Using cached content for {url} (not modified)")
+                    return cached["body"]
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "").lower()
+                if content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+                    # PDFs, images, archives etc. carry nothing we can extract
+                    logger.info(f"Skipping non-HTML content at {url} ({content_type})")
+                    return ""
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) >= MAX_HTML_BYTES:
+                        logger.warning(f"Truncating {url} at {MAX_HTML_BYTES} bytes")
+                        del body[MAX_HTML_BYTES:]
+                        break
+                try:
+                    text = body.decode(html_body_encoding(content_type, body), errors="replace")
+                except LookupError:
+                    text = body.decode("utf-8", errors="replace")
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    with _http_cache_lock:
+                        _http_cache[url] = {
+                            "etag": etag,
+                            "last_modified": last_modified,
+                            "body": text
+                        }
+                return text
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching content with requests for {url}: {str(e)}")
             return ""
@@ -103,6 +320,9 @@ class ContentExtractor:
     
     def extract_main_content(self, html_content: str) -> str:
         """Extract main content from HTML, excluding headers, footers, and navigation.
+
+        Results are cached by a hash of the HTML, so identical pages (a revalidated
+        body, the same template under several URLs) are only parsed once.
         
         Args:
             html_content: Raw HTML content
@@ -112,92 +332,91 @@ class ContentExtractor:
         """
         if not html_content:
             return ""
-        
+
+        key = hashlib.blake2b(
+            html_content.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        with _main_content_cache_lock:
+            cached = _main_content_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if EXTRACTION_PROCESSES and len(html_content) >= EXTRACTION_PROCESS_MIN_CHARS:
+            text_content = self._extract_main_content_in_pool(html_content)
+        else:
+            text_content = self._extract_main_content(html_content)
+        with _main_content_cache_lock:
+            _main_content_cache[key] = text_content
+        return text_content
+
+    def _extract_main_content_in_pool(self, html_content: str) -> str:
+        """Run _extract_main_content in the extraction process pool.
+
+        Falls back to parsing in the calling thread if the pool cannot be used.
+        """
+        pool = _get_extraction_pool()
+        try:
+            return pool.submit(_extract_main_content_worker, html_content).result()
+        except concurrent.futures.process.BrokenProcessPool as e:
+            logger.warning(f"Extraction process pool failed, parsing in-thread: {str(e)}")
+            _reset_extraction_pool(pool)
+            return self._extract_main_content(html_content)
+
+    def _extract_main_content(self, html_content: str) -> str:
+        """Uncached main content extraction behind extract_main_content."""
+        if NON_HTML_PREFIX_RE.match(html_content):
+            # JSON or a PDF that slipped past the Content-Type check
+            return ""
+        if len(html_content) < MIN_CONTENT_LENGTH * 2:
+            # Too small to hold an article (error pages, redirects); skip readability
+            return _basic_page_text(html_content)
+
         try:
             # Initial parse for pre-cleaning
-            pre_soup = BeautifulSoup(html_content, 'html.parser')
+            pre_soup = BeautifulSoup(html_content, HTML_PARSER)
 
             # Perform aggressive cleaning *before* readability
             # All cleaning operations below use 'pre_soup'
 
-            unwanted_tag_names = [
-                'script', 'style', 'nav', 'header', 'footer', 
-                'aside', 'advertisement', 'ads', 'sidebar',
-                'menu', 'breadcrumb', 'social', 'share', 'dialog',
-                'form', 'input', 'textarea', 'button', 'select', 'option',
-                'iframe', 'canvas', 'map', 'object', 'embed'
-            ]
-            for tag_name_iter in unwanted_tag_names:
-                for element in pre_soup.find_all(tag_name_iter):
-                    element.decompose()
+            # One traversal for all unwanted tags, one for all selectors
+            for element in pre_soup.find_all(UNWANTED_TAG_NAMES):
+                element.decompose()
 
-            specific_selectors = [
-                '[role="navigation"]', '[role="banner"]', '[role="contentinfo"]',
-                '[aria-modal="true"]', '[role="dialog"]', '[role="alert"]',
-                # 'header', 'footer', 'nav', 'aside', # Covered by unwanted_tag_names
-                '.cookie', '#cookie', '.banner', '#banner', '.popup', '#popup',
-                '.modal', '#modal', '.dialog', '#dialog', '.gdpr', '.cc-banner',
-                '[class*="cookie"]', '[id*="cookie"]',
-                '[class*="banner"]', '[id*="banner"]',
-                '[class*="popup"]', '[id*="popup"]',
-                '[class*="modal"]', '[id*="modal"]',
-                '[class*="dialog"]', '[id*="dialog"]',
-                '[class*="consent"]', '[id*="consent"]',
-                '[class*="gdpr"]', '[id*="gdpr"]'
-            ]
-            for selector in specific_selectors:
-                try:
-                    for element in pre_soup.select(selector):
-                        element.decompose()
-                except Exception as e_select:
-                    logger.warning(f"CSS selector error during pre-cleaning: {selector} - {str(e_select)}")
-
-            unwanted_patterns = [
-                'nav', 'header', 'footer', 'sidebar', 'menu', 'masthead', 'bottom',
-                'advertisement', 'ads', 'social', 'share', 'rating', 'metadata',
-                'breadcrumb', 'pagination', 'related', 'comment', 'testimonial', 'author-bio',
-                'cookie', 'banner', 'popup', 'modal', 'dialog', 'consent', 'gdpr',
-                'widget', 'toolbar', 'utility-bar', 'skip-link', 'visually-hidden', 'sr-only',
-                'cookie-consent', 'privacy-popup' # Added from original list that was missed
-            ]
-            for pattern in unwanted_patterns:
-                for element in pre_soup.find_all(class_=re.compile(r'\b' + pattern + r'\b', re.I)):
-                    element.decompose()
-                for element in pre_soup.find_all(id=re.compile(r'\b' + pattern + r'\b', re.I)):
+            try:
+                for element in pre_soup.select(UNWANTED_SELECTOR):
                     element.decompose()
+            except Exception as e_select:
+                logger.warning(f"CSS selector error during pre-cleaning: {str(e_select)}")
+
+            for element in pre_soup.find_all(class_=UNWANTED_CLASS_ID_RE):
+                element.decompose()
+            for element in pre_soup.find_all(id=UNWANTED_CLASS_ID_RE):
+                element.decompose()
 
-            elements_to_remove_hidden = []
-            for element in pre_soup.find_all(True):
-                style = element.get('style', '').replace(' ', '').lower()
-                if 'display:none' in style or 'visibility:hidden' in style:
-                    elements_to_remove_hidden.append(element)
-            for element in elements_to_remove_hidden:
+            for element in pre_soup.find_all(style=HIDDEN_STYLE_RE):
                 element.decompose()
 
-            cleaned_html_for_readability = pre_soup.prettify()
+            # Plain serialization: prettify() would add a whitespace pass that
+            # readability reparses anyway
+            cleaned_html_for_readability = str(pre_soup)
             doc = Document(cleaned_html_for_readability)
-            main_content_html_from_readability = doc.summary()
+            # No <html><body> wrapper; only its text is used
+            main_content_html_from_readability = doc.summary(html_partial=True)
 
-            final_soup = BeautifulSoup(main_content_html_from_readability, 'html.parser')
+            final_soup = BeautifulSoup(main_content_html_from_readability, HTML_PARSER)
             text_content = final_soup.get_text(separator=' ', strip=True)
             
             if not text_content and html_content:
                 logger.warning("Readability produced empty content from pre-cleaned HTML. Using text from pre-cleaned HTML itself.")
                 text_content = pre_soup.get_text(separator=' ', strip=True)
             
-            text_content = re.sub(r'\s+', ' ', text_content).strip()
+            text_content = WHITESPACE_RE.sub(' ', text_content).strip()
             
             if not text_content and html_content:
                  logger.warning("All extraction methods resulted in empty. Basic pass on original HTML.")
-                 soup_basic_pass = BeautifulSoup(html_content, 'html.parser')
-                 basic_unwanted_tags = ['script', 'style', 'nav', 'header', 'footer', 'aside']
-                 for tag_name_iter_basic in basic_unwanted_tags: # Renamed var
-                     for tag_element_basic in soup_basic_pass.find_all(tag_name_iter_basic):
-                         tag_element_basic.decompose()
-                 text_content = soup_basic_pass.get_text(separator=' ', strip=True)
-                 text_content = re.sub(r'\s+', ' ', text_content).strip()
+                 text_content = _basic_page_text(html_content)
 
-            text_content = re.sub(r'\s+', ' ', text_content).strip()
+            text_content = WHITESPACE_RE.sub(' ', text_content).strip()
 
             if 0 < len(text_content) < MIN_CONTENT_LENGTH and html_content:
                 pass
@@ -206,10 +425,10 @@ class ContentExtractor:
                 text_content = text_content[:MAX_CONTENT_LENGTH] + "..."
             
             if not text_content and html_content:
-                soup_fallback_body = BeautifulSoup(html_content, 'html.parser') # Renamed var
+                soup_fallback_body = BeautifulSoup(html_content, HTML_PARSER) # Renamed var
                 if soup_fallback_body.body:
                     text_content = soup_fallback_body.body.get_text(separator=' ', strip=True)
-                    text_content = re.sub(r'\s+', ' ', text_content).strip()
+                    text_content = WHITESPACE_RE.sub(' ', text_content).strip()
                     if len(text_content) > MAX_CONTENT_LENGTH:
                         text_content = text_content[:MAX_CONTENT_LENGTH] + "..."
                 if not text_content:
@@ -219,13 +438,7 @@ class ContentExtractor:
             
         except Exception as e:
             logger.error(f"Error extracting main content: {str(e)}")
-            soup_fallback_exception = BeautifulSoup(html_content, 'html.parser')
-            basic_unwanted_tags_exception = ['script', 'style', 'nav', 'header', 'footer', 'aside'] # Renamed var
-            for tag_name_iter_exception in basic_unwanted_tags_exception: # Renamed var
-                for tag_element in soup_fallback_exception.find_all(tag_name_iter_exception):
-                    tag_element.decompose()
-            fallback_text = soup_fallback_exception.get_text(separator=' ', strip=True)
-            fallback_text = re.sub(r'\s+', ' ', fallback_text).strip()
+            fallback_text = _basic_page_text(html_content)
             if len(fallback_text) > MAX_CONTENT_LENGTH:
                 fallback_text = fallback_text[:MAX_CONTENT_LENGTH] + "..."
             return fallback_text
@@ -241,7 +454,17 @@ class ContentExtractor:
             Tuple of (title, meta_description)
         """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Only <title> and <meta> are needed, so nothing else gets built into the tree,
+            # and only the <head> gets parsed when its end tag can be found
+            head_end = HEAD_END_RE.search(html_content)
+            markup = html_content[:head_end.end()] if head_end else html_content
+            soup = BeautifulSoup(markup, HTML_PARSER, parse_only=TITLE_META_STRAINER)
+            has_description = soup.find("meta", attrs={"name": "description"}) or soup.find(
+                "meta", attrs={"property": "og:description"}
+            )
+            if head_end and not (soup.title and has_description):
+                # e.g. a "</head>" inside an inline script cut the head short; parse the whole page
+                soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=TITLE_META_STRAINER)
             
             # Get title
             title = ""
@@ -250,11 +473,11 @@ class ContentExtractor:
             
             # Fallback title from URL
             if not title and url:
-                from urllib.parse import urlparse
-                path = urlparse(url).path
-                title = path.strip('/').split('/')[-1].replace('-', ' ').replace('_', ' ').title()
+                parsed_url = urlparse(url)
+                last_segment = parsed_url.path.strip('/').split('/')[-1]
+                title = last_segment.replace('-', ' ').replace('_', ' ').title()
                 if not title:
-                    title = urlparse(url).netloc
+                    title = parsed_url.netloc
             
             # Get meta description
             description = ""
@@ -281,6 +504,11 @@ class ContentExtractor:
             self.browser = None
 
 
+# Shared by every extract_content_sync call so Chromium is launched once, not per URL;
+# its browser lives on the background loop that utils.run_async drives
+_puppeteer_extractor = ContentExtractor(use_puppeteer=True)
+
+
 # Synchronous wrapper functions for easier integration
 def extract_content_sync(url: str, use_puppeteer: bool = False) -> Tuple[str, str, str]:
     """Synchronous wrapper for content extraction.
@@ -292,27 +520,30 @@ def extract_content_sync(url: str, use_puppeteer: bool = False) -> Tuple[str, st
     Returns:
         Tuple of (title, meta_description, main_content)
     """
+    cache_key = (url, use_puppeteer)
+    with _extraction_cache_lock:
+        cached = _extraction_cache.get(cache_key)
+    if cached:
+        return cached
+
     extractor = ContentExtractor(use_puppeteer)
     
     try:
-        # Run async extraction
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        html_content = loop.run_until_complete(extractor.get_page_content(url))
+        if use_puppeteer:
+            # Render on the shared background loop with one long-lived browser
+            html_content = run_async(_puppeteer_extractor.get_page_content(url))
+        else:
+            # Plain HTTP fetches block anyway, so skip creating an event loop per URL
+            html_content = extractor.get_page_content_requests(url)
         
         if html_content:
             title, meta_desc = extractor.extract_title_and_meta(html_content, url)
             main_content = extractor.extract_main_content(html_content)
-            
-            # Close browser if used
-            loop.run_until_complete(extractor.close())
-            loop.close()
-            
-            return title, meta_desc, main_content
+            result = (title, meta_desc, main_content)
+            with _extraction_cache_lock:
+                _extraction_cache[cache_key] = result
+            return result
         else:
-            loop.run_until_complete(extractor.close())
-            loop.close()
             return f"Page at {url.split('/')[-1]}", "Resource information", ""
             
     except Exception as e:
@@ -1,13 +1,113 @@
 """OpenRouter API client for LLM integration."""
 
+import asyncio
+import hashlib
 import httpx
-import json
 import logging
-from typing import Optional, Dict, Any
-from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, DEFAULT_MODEL
+import orjson
+import sqlite3
+import threading
+import time
+from cachetools import LRUCache
+from typing import Optional, Dict, Any, List
+from config import (
+    OPENROUTER_API_KEY,
+    OPENROUTER_BASE_URL,
+    DEFAULT_MODEL,
+    LLM_BATCH_SIZE,
+    LLM_BATCH_CONTENT_LENGTH,
+    LLM_MAX_CONCURRENT_REQUESTS,
+    DESCRIPTION_CACHE_MAXSIZE,
+    DESCRIPTION_CACHE_PATH,
+    DESCRIPTION_CACHE_TTL,
+    OPENROUTER_MAX_KEEPALIVE,
+    OPENROUTER_SYNC_CLIENTS
+)
+from utils import run_async
 
 logger = logging.getLogger(__name__)
 
+# Generated descriptions, so identical pages are never sent to the model twice
+_description_cache = LRUCache(maxsize=DESCRIPTION_CACHE_MAXSIZE)
+_description_cache_lock = threading.Lock()
+
+# Optional on-disk tier behind the LRU, so paid descriptions survive app restarts
+_description_db = None
+
+def _description_store() -> Optional[sqlite3.Connection]:
+    """Open the persistent description store on first use; call with the cache lock held."""
+    global _description_db
+    if _description_db is None and DESCRIPTION_CACHE_PATH:
+        try:
+            _description_db = sqlite3.connect(DESCRIPTION_CACHE_PATH, check_same_thread=False)
+            with _description_db:
+                _description_db.execute(
+                    "CREATE TABLE IF NOT EXISTS descriptions "
+                    "(key TEXT PRIMARY KEY, description TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                # Expired rows are never read again, so drop them instead of growing the file
+                _description_db.execute(
+                    "DELETE FROM descriptions WHERE created <= ?",
+                    (time.time() - DESCRIPTION_CACHE_TTL,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(
+                f"Description cache disabled, cannot open {DESCRIPTION_CACHE_PATH}: {str(e)}"
+            )
+            _description_db = False
+    return _description_db or None
+
+def _description_cache_key(content: str, title: str, url: str, model: str) -> str:
+    """Build the description cache key from everything that shapes the prompt."""
+    return hashlib.sha256(f"{model}\n{url}\n{title}\n{content}".encode()).hexdigest()
+
+def _get_cached_descriptions(keys: List[str]) -> Dict[str, str]:
+    """Return the previously generated descriptions for any of the cache keys.
+
+    Blocks on SQLite, so coroutines should run it with asyncio.to_thread.
+    """
+    with _description_cache_lock:
+        found = {key: _description_cache[key] for key in keys if key in _description_cache}
+        store = _description_store()
+        missing = [key for key in keys if key not in found]
+        # Chunked to stay under SQLite's limit on bound parameters
+        for i in range(0, len(missing) if store is not None else 0, 500):
+            chunk = missing[i:i + 500]
+            rows = store.execute(
+                f"SELECT key, description FROM descriptions "
+                f"WHERE key IN ({', '.join('?' * len(chunk))}) AND created > ?",
+                (*chunk, time.time() - DESCRIPTION_CACHE_TTL),
+            ).fetchall()
+            for key, description in rows:
+                found[key] = _description_cache[key] = description
+        return found
+
+def _cache_descriptions(descriptions: Dict[str, str]) -> None:
+    """Remember generated descriptions by cache key, persisting them in one transaction.
+
+    Blocks on SQLite, so coroutines should run it with asyncio.to_thread.
+    """
+    if not descriptions:
+        return
+    with _description_cache_lock:
+        _description_cache.update(descriptions)
+        store = _description_store()
+        if store is not None:
+            now = time.time()
+            with store:
+                store.executemany(
+                    "INSERT OR REPLACE INTO descriptions VALUES (?, ?, ?)",
+                    [(key, description, now) for key, description in descriptions.items()],
+                )
+
+BATCH_DESCRIPTION_INSTRUCTIONS = (
+    "You write concise, informative descriptions (1-2 sentences) of web pages. "
+    "For each page in the JSON array you are given, summarize the main topic, purpose, "
+    "and key information covered, so the description is useful for someone deciding "
+    "whether to visit the page. Respond with a single JSON object mapping each page's "
+    "\"url\" to its description, and nothing else."
+)
+
 class OpenRouterClient:
     """Client for interacting with OpenRouter API."""
     
@@ -25,6 +125,26 @@ class OpenRouterClient:
             "HTTP-Referer": "https://github.com/your-repo/llms-txt-generator",
             "X-Title": "LLMS.txt Generator"
         }
+        self._client = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Return this client's pooled HTTP client, creating it on first use.
+
+        Keeping it open lets successive requests to OpenRouter reuse the same
+        TLS connections instead of reconnecting for every description.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=OPENROUTER_MAX_KEEPALIVE)
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client if it was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def generate_description(
         self, 
@@ -54,44 +174,232 @@ class OpenRouterClient:
             logger.warning("Empty content provided for description generation")
             return None
         
+        cache_key = _description_cache_key(content, title, url, model)
+        cached = (await asyncio.to_thread(_get_cached_descriptions, [cache_key])).get(cache_key)
+        if cached:
+            return cached
+
+        description = await self._request_description(content, title, url, model, max_tokens)
+        if description:
+            await asyncio.to_thread(_cache_descriptions, {cache_key: description})
+        return description
+
+    async def _request_description(
+        self,
+        content: str,
+        title: str,
+        url: str,
+        model: str,
+        max_tokens: int
+    ) -> Optional[str]:
+        """Ask the model for one page's description, without touching the cache.
+
+        Returns:
+            Generated description or None if failed
+        """
         # Create the prompt
         prompt = self._create_description_prompt(content, title, url)
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json={
-                        "model": model,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "max_tokens": max_tokens,
-                        "temperature": 0.3,
-                        "top_p": 0.9
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if "choices" in result and len(result["choices"]) > 0:
-                        description = result["choices"][0]["message"]["content"].strip()
-                        return description
-                    else:
-                        logger.error(f"Unexpected response format: {result}")
-                        return None
+            response = await self._http_client().post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                content=orjson.dumps({
+                    "model": model,
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "max_tokens": max_tokens,
+                    "temperature": 0.3,
+                    "top_p": 0.9
+                })
+            )
+            
+            if response.status_code == 200:
+                result = orjson.loads(response.content)
+                if "choices" in result and len(result["choices"]) > 0:
+                    return result["choices"][0]["message"]["content"].strip()
                 else:
-                    logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
+                    logger.error(f"Unexpected response format: {result}")
                     return None
-                    
+            else:
+                logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
+                return None
+                
         except Exception as e:
             logger.error(f"Error calling OpenRouter API: {str(e)}")
             return None
     
+    async def generate_descriptions_batch(
+        self,
+        pages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        max_tokens_per_page: int = 200
+    ) -> Dict[str, Optional[str]]:
+        """Generate descriptions for several pages, packing many pages into each request.
+
+        Pages are split into groups of LLM_BATCH_SIZE and each group is described
+        by one JSON-mode request; up to LLM_MAX_CONCURRENT_REQUESTS requests are in
+        flight at once, so a failed batch can't flood OpenRouter. Pages missing from
+        a batch response (or in a batch whose response cannot be parsed) are
+        retried one request per page. Cache reads and writes run off the event loop,
+        with each round's new descriptions stored in a single transaction.
+
+        Args:
+            pages: List of dicts with "url", "content" and optional "title" keys
+            model: The LLM model to use
+            max_tokens_per_page: Response token budget per page in a batch
+
+        Returns:
+            Dict mapping each page URL to its description, or None if failed
+        """
+        if not self.api_key:
+            logger.warning("No OpenRouter API key provided")
+            return {page["url"]: None for page in pages}
+
+        descriptions = {}
+        cache_keys = {
+            page["url"]: _description_cache_key(
+                page["content"], page.get("title", ""), page["url"], model
+            )
+            for page in pages
+        }
+        # One lookup for the whole call, off the loop since it may read SQLite
+        cached = await asyncio.to_thread(_get_cached_descriptions, list(cache_keys.values()))
+        uncached = []
+        for page in pages:
+            if cached.get(cache_keys[page["url"]]):
+                descriptions[page["url"]] = cached[cache_keys[page["url"]]]
+            else:
+                uncached.append(page)
+
+        batches = [uncached[i:i + LLM_BATCH_SIZE] for i in range(0, len(uncached), LLM_BATCH_SIZE)]
+        # Created here rather than in __init__ so it binds to the running loop on Python < 3.10
+        request_slots = asyncio.Semaphore(LLM_MAX_CONCURRENT_REQUESTS)
+
+        async def limited(coro):
+            async with request_slots:
+                return await coro
+
+        if batches:
+            batch_results = await asyncio.gather(*[
+                limited(self._describe_batch(batch, model, max_tokens_per_page))
+                for batch in batches
+            ])
+
+            generated = {}
+            for result in batch_results:
+                for url, description in result.items():
+                    descriptions[url] = description
+                    generated[cache_keys[url]] = description
+            await asyncio.to_thread(_cache_descriptions, generated)
+
+        # Fall back to one request per page for anything the batches did not cover
+        missing = [
+            page for page in pages
+            if not descriptions.get(page["url"]) and page["content"].strip()
+        ]
+        if missing:
+            logger.info(f"Falling back to per-page descriptions for {len(missing)} pages")
+            fallbacks = await asyncio.gather(*[
+                limited(self._request_description(
+                    page["content"], page.get("title", ""), page["url"], model, max_tokens_per_page
+                ))
+                for page in missing
+            ])
+            generated = {}
+            for page, description in zip(missing, fallbacks):
+                descriptions[page["url"]] = description
+                if description:
+                    generated[cache_keys[page["url"]]] = description
+            await asyncio.to_thread(_cache_descriptions, generated)
+
+        return {page["url"]: descriptions.get(page["url"]) for page in pages}
+
+    async def _describe_batch(
+        self,
+        batch: List[Dict[str, str]],
+        model: str,
+        max_tokens_per_page: int
+    ) -> Dict[str, str]:
+        """Describe one batch of pages with a single JSON-mode request.
+
+        Args:
+            batch: Pages to describe
+            model: The LLM model to use
+            max_tokens_per_page: Response token budget per page
+
+        Returns:
+            Dict of URL to description for the pages the model answered; empty on failure
+        """
+        payload = [
+            {
+                "url": page["url"],
+                "title": page.get("title", ""),
+                "content": page["content"][:LLM_BATCH_CONTENT_LENGTH]
+            }
+            for page in batch
+        ]
+
+        try:
+            response = await self._http_client().post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                timeout=60.0, # Multi-page answers take longer
+                content=orjson.dumps({
+                    "model": model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": [
+                                {
+                                    "type": "text",
+                                    "text": BATCH_DESCRIPTION_INSTRUCTIONS,
+                                    # Identical across batches, so providers can cache it
+                                    "cache_control": {"type": "ephemeral"}
+                                }
+                            ]
+                        },
+                        {
+                            "role": "user",
+                            "content": orjson.dumps(payload).decode()
+                        }
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": max_tokens_per_page * len(batch),
+                    "temperature": 0.3,
+                    "top_p": 0.9
+                })
+            )
+
+            if response.status_code != 200:
+                logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
+                return {}
+
+            result = orjson.loads(response.content)
+            content = result["choices"][0]["message"]["content"]
+            parsed = orjson.loads(content)
+            if not isinstance(parsed, dict):
+                logger.error(f"Unexpected batch response format: {content}")
+                return {}
+
+            urls = {page["url"] for page in batch}
+            return {
+                url: description.strip()
+                for url, description in parsed.items()
+                if url in urls and isinstance(description, str) and description.strip()
+            }
+
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            logger.error(f"Could not parse batch description response: {str(e)}")
+            return {}
+        except Exception as e:
+            logger.error(f"Error calling OpenRouter API: {str(e)}")
+            return {}
+
     def _create_description_prompt(self, content: str, title: str = "", url: str = "") -> str:
         """Create a prompt for generating page descriptions.
         
@@ -131,6 +439,32 @@ class OpenRouterClient:
         return bool(self.api_key and self.api_key.strip())
 
 
+# Clients reused by the sync wrappers, keyed by a hash of the API key so raw keys aren't
+# kept around. They all run on the shared background loop (utils.run_async), so their
+# pooled connections stay valid between calls.
+_sync_clients = LRUCache(maxsize=OPENROUTER_SYNC_CLIENTS)
+_sync_clients_lock = threading.Lock()
+
+def _sync_client(api_key: Optional[str]) -> OpenRouterClient:
+    """Return the shared OpenRouterClient for an API key, creating it on first use.
+
+    The least recently used client is closed once more than OPENROUTER_SYNC_CLIENTS keys
+    are in use, so a long-running app doesn't keep a connection pool open per key forever.
+    """
+    key = hashlib.sha256((api_key or "").encode()).hexdigest()
+    evicted = None
+    with _sync_clients_lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            if len(_sync_clients) >= _sync_clients.maxsize:
+                _, evicted = _sync_clients.popitem()
+            client = _sync_clients[key] = OpenRouterClient(api_key)
+    if evicted is not None:
+        # Closed outside the lock, so other keys aren't held up by the loop round trip
+        run_async(evicted.aclose())
+    return client
+
+
 # Synchronous wrapper for easier integration
 def generate_description_sync(
     content: str, 
@@ -151,19 +485,35 @@ def generate_description_sync(
     Returns:
         Generated description or None if failed
     """
-    import asyncio
-    
-    client = OpenRouterClient(api_key)
+    client = _sync_client(api_key)
     
     try:
-        # Run the async function in a new event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            client.generate_description(content, title, url, model)
-        )
-        loop.close()
-        return result
+        # Run on the shared background loop instead of creating one per call
+        return run_async(client.generate_description(content, title, url, model))
     except Exception as e:
         logger.error(f"Error in synchronous description generation: {str(e)}")
         return None
+
+
+def generate_descriptions_batch_sync(
+    pages: List[Dict[str, str]],
+    model: str = DEFAULT_MODEL,
+    api_key: str = None
+) -> Dict[str, Optional[str]]:
+    """Synchronous wrapper for generating descriptions for many pages at once.
+
+    Args:
+        pages: List of dicts with "url", "content" and optional "title" keys
+        model: The LLM model to use
+        api_key: OpenRouter API key (optional)
+
+    Returns:
+        Dict mapping each page URL to its description, or None if failed
+    """
+    client = _sync_client(api_key)
+
+    try:
+        return run_async(client.generate_descriptions_batch(pages, model))
+    except Exception as e:
+        logger.error(f"Error in synchronous batch description generation: {str(e)}")
+        return {page["url"]: None for page in pages}
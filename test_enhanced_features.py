@@ -2,43 +2,54 @@
 
 import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from content_extractor import ContentExtractor, extract_content_sync
 from openrouter_client import OpenRouterClient, generate_description_sync
-from config import DEFAULT_MODEL, CATEGORIZED_LLM_MODELS, validate_custom_model
+from config import DEFAULT_MODEL, CATEGORIZED_LLM_MODELS
+from config import validate_custom_model, validate_custom_models
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The network-bound tests run concurrently; keep each printed line whole
+_print_lock = threading.Lock()
+
+def log(*args):
+    """Print from any test thread without interleaving lines."""
+    with _print_lock:
+        print(*args)
+
 def test_content_extraction():
     """Test content extraction without Puppeteer."""
-    print("Testing content extraction...")
+    log("Testing content extraction...")
     
     test_url = "https://example.com"
     
     try:
         title, meta_desc, main_content = extract_content_sync(test_url, use_puppeteer=False)
         
-        print(f"URL: {test_url}")
-        print(f"Title: {title}")
-        print(f"Meta Description: {meta_desc}")
-        print(f"Main Content Length: {len(main_content)} characters")
-        print(f"Main Content Preview: {main_content[:200]}...")
-        print("✅ Content extraction test passed!")
+        log(f"URL: {test_url}")
+        log(f"Title: {title}")
+        log(f"Meta Description: {meta_desc}")
+        log(f"Main Content Length: {len(main_content)} characters")
+        log(f"Main Content Preview: {main_content[:200]}...")
+        log("✅ Content extraction test passed!")
         
     except Exception as e:
-        print(f"❌ Content extraction test failed: {str(e)}")
+        log(f"❌ Content extraction test failed: {str(e)}")
 
 def test_openrouter_client():
     """Test OpenRouter client (without actual API call)."""
-    print("\nTesting OpenRouter client...")
+    log("\nTesting OpenRouter client...")
     
     try:
         client = OpenRouterClient()
         
         # Test configuration check
         is_configured = client.is_configured()
-        print(f"Client configured: {is_configured}")
+        log(f"Client configured: {is_configured}")
         
         # Test prompt creation
         test_content = "This is a test page about Python programming."
@@ -46,11 +57,11 @@ def test_openrouter_client():
         test_url = "https://example.com/python-guide"
         
         prompt = client._create_description_prompt(test_content, test_title, test_url)
-        print(f"Generated prompt length: {len(prompt)} characters")
-        print("✅ OpenRouter client test passed!")
+        log(f"Generated prompt length: {len(prompt)} characters")
+        log("✅ OpenRouter client test passed!")
         
     except Exception as e:
-        print(f"❌ OpenRouter client test failed: {str(e)}")
+        log(f"❌ OpenRouter client test failed: {str(e)}")
 
 def test_model_validation():
     """Test model validation functionality."""
@@ -67,8 +78,8 @@ def test_model_validation():
             "custom-provider/my-model:variant"
         ]
 
-        for model in valid_models:
-            if validate_custom_model(model):
+        for model, is_valid in zip(valid_models, validate_custom_models(valid_models)):
+            if is_valid:
                 print(f"✅ Valid: {model}")
             else:
                 print(f"❌ Should be valid: {model}")
@@ -85,8 +96,8 @@ def test_model_validation():
             None
         ]
 
-        for model in invalid_models:
-            if not validate_custom_model(model):
+        for model, is_valid in zip(invalid_models, validate_custom_models(invalid_models)):
+            if not is_valid:
                 print(f"✅ Correctly rejected: {model}")
             else:
                 print(f"❌ Should be invalid: {model}")
@@ -108,15 +119,15 @@ def test_model_validation():
 
 def test_enhanced_workflow():
     """Test the complete enhanced workflow."""
-    print("\nTesting enhanced workflow...")
+    log("\nTesting enhanced workflow...")
 
     test_url = "https://httpbin.org/html"  # Simple HTML test page
 
     try:
         # Test without LLM
         title1, desc1, content1 = extract_content_sync(test_url, use_puppeteer=False)
-        print(f"Without LLM - Title: {title1}")
-        print(f"Without LLM - Description: {desc1}")
+        log(f"Without LLM - Title: {title1}")
+        log(f"Without LLM - Description: {desc1}")
 
         # Test with mock LLM (no API key)
         mock_description = generate_description_sync(
@@ -128,24 +139,30 @@ def test_enhanced_workflow():
         )
 
         if mock_description is None:
-            print("✅ LLM integration correctly handles missing API key")
+            log("✅ LLM integration correctly handles missing API key")
         else:
-            print(f"LLM Description: {mock_description}")
+            log(f"LLM Description: {mock_description}")
 
-        print("✅ Enhanced workflow test passed!")
+        log("✅ Enhanced workflow test passed!")
 
     except Exception as e:
-        print(f"❌ Enhanced workflow test failed: {str(e)}")
+        log(f"❌ Enhanced workflow test failed: {str(e)}")
 
 def main():
     """Run all tests."""
     print("🧪 Testing Enhanced LLMS.txt Generator Features")
     print("=" * 50)
 
-    test_content_extraction()
-    test_openrouter_client()
+    # The extraction tests wait on real HTTP round-trips, so overlap them
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(test)
+            for test in (test_content_extraction, test_openrouter_client, test_enhanced_workflow)
+        ]
+        for future in futures:
+            future.result()
+
     test_model_validation()
-    test_enhanced_workflow()
 
     print("\n" + "=" * 50)
     print("🎉 All tests completed!")
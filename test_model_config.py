@@ -11,6 +11,7 @@ try:
         CATEGORIZED_LLM_MODELS, 
         DEFAULT_MODEL, 
         validate_custom_model, 
+        validate_custom_models,
         get_model_display_name
     )
     
@@ -59,14 +60,12 @@ try:
         ]
         
         print("  Valid models:")
-        for model in valid_test_cases:
-            is_valid = validate_custom_model(model)
+        for model, is_valid in zip(valid_test_cases, validate_custom_models(valid_test_cases)):
             status = "✅" if is_valid else "❌"
             print(f"    {status} {model}")
         
         print("  Invalid models:")
-        for model in invalid_test_cases:
-            is_valid = validate_custom_model(model)
+        for model, is_valid in zip(invalid_test_cases, validate_custom_models(invalid_test_cases)):
             status = "✅" if not is_valid else "❌"
             print(f"    {status} {model} (correctly rejected)")
         
@@ -3,10 +3,20 @@ from unittest.mock import patch, MagicMock
 import sys
 import requests # <--- Added this import
 import os
+import io
+import gzip
+from types import SimpleNamespace
 
 # Add parent directory to path to import app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app import categorize_urls, find_md_link, generate_llms_txt, clean_description
+from app import describe_extracted_pages, process_url_tasks
+from app import check_llm_crawler_accessibility, batch_process_categories
+from app import iter_sitemap_locs, fetch_sitemap_entries, extract_urls_from_sitemap
+from app import extract_urls_from_csv
+from app import derive_site_name, load_sitemap_urls, URLListError
+from app import MODEL_OPTIONS, MODEL_VALUES, MODEL_VALUE_BY_OPTION, DEFAULT_MODEL_INDEX
+from config import MD_PROBE_HOST_GIVE_UP, DEFAULT_MODEL
 
 # DEFAULT_CATEGORY_KEYWORDS from app.py, copied here for test independence
 DEFAULT_CATEGORY_KEYWORDS = {
@@ -44,45 +54,32 @@ class TestAppLogic(unittest.TestCase):
         self.assertIn("http://example.com/blog/random-post", categorized["Other"])
         self.assertEqual(len(categorized["Dashboard"]), 0)
 
-    @patch('requests.head')
+    @patch('app.PROBE_SESSION.head')
     def test_find_md_link(self, mock_head):
-        # Test case 1: .md file exists (e.g., page.html -> page.md)
-        # Default mock response for cases where we expect a 404 or don't care about specific URL
-        mock_response_not_found = MagicMock()
-        mock_response_not_found.status_code = 404
+        # find_md_link only reads status_code and url, so plain namespaces built once will do
+        def found(url):
+            return SimpleNamespace(status_code=200, url=url)
 
-        def side_effect_logic(url_to_check, **kwargs):
+        responses = {
             # Case 1: page.html -> page.md
-            if url_to_check == "http://example.com/docs/feature.md":
-                resp = MagicMock()
-                resp.status_code = 200
-                resp.url = "http://example.com/docs/feature.md"
-                return resp
+            "http://example.com/docs/feature.md": found("http://example.com/docs/feature.md"),
             # Case 2: /docs/main -> /docs/main.md
-            elif url_to_check == "http://example.com/docs/main.md":
-                resp = MagicMock()
-                resp.status_code = 200
-                resp.url = "http://example.com/docs/main.md"
-                return resp
-            # Case 3: /docs/dir/ -> /docs/dir.md (assuming /docs/dir/dir.md 404s)
-            elif url_to_check == "http://example.com/docs/dir/dir.md": # First attempt by find_md_link for trailing slash
-                return mock_response_not_found
-            elif url_to_check == "http://example.com/docs/dir.md": # Second attempt
-                resp = MagicMock()
-                resp.status_code = 200
-                resp.url = "http://example.com/docs/dir.md"
-                return resp
+            "http://example.com/docs/main.md": found("http://example.com/docs/main.md"),
+            # Case 3: /docs/dir/ -> /docs/dir.md
+            # (/docs/dir/dir.md, tried first, falls through to 404)
+            "http://example.com/docs/dir.md": found("http://example.com/docs/dir.md"),
+            # Case 6: Redirect to non-md
+            "http://example.com/docs/redirect-test.md":
+                found("http://example.com/docs/redirect-test.html"),
+        }
+        # Default for others (like no-such-file.md)
+        not_found = SimpleNamespace(status_code=404, url=None)
+
+        def side_effect_logic(url_to_check, **kwargs):
             # Case 5: Timeout
-            elif url_to_check == "http://example.com/docs/timeout.md":
+            if url_to_check == "http://example.com/docs/timeout.md":
                 raise requests.exceptions.Timeout
-            # Case 6: Redirect to non-md
-            elif url_to_check == "http://example.com/docs/redirect-test.md":
-                resp = MagicMock()
-                resp.status_code = 200
-                resp.url = "http://example.com/docs/redirect-test.html" # Redirected to non-.md
-                return resp
-            # Default for others (like no-such-file.md)
-            return mock_response_not_found
+            return responses.get(url_to_check, not_found)
 
         mock_head.side_effect = side_effect_logic
 
@@ -108,25 +105,49 @@ class TestAppLogic(unittest.TestCase):
         mock_head.side_effect = None # Disable side_effect for this simple case not involving requests
         self.assertIsNone(find_md_link("ftp://example.com/docs/feature.html"))
 
-    @patch('app.batch_process_urls') # Patching where it's used
-    def test_generate_llms_txt_structure_and_format(self, mock_batch_process_urls):
-        # Mock the return value of batch_process_urls
-        # Each category will call batch_process_urls once.
-        # Let's simulate two categories: Introduction and API Reference
-        def mock_batch_side_effect(*args, **kwargs):
-            urls_being_processed = args[0] # The list of URLs for the category
-            if "http://example.com/intro" in urls_being_processed[0]:
-                return [
+    @patch('app.PROBE_SESSION.head')
+    def test_find_md_link_gives_up_on_hosts_without_md(self, mock_head):
+        mock_head.return_value = MagicMock(status_code=404)
+
+        for i in range(MD_PROBE_HOST_GIVE_UP):
+            self.assertIsNone(find_md_link(f"http://no-md.example.com/page-{i}"))
+        self.assertEqual(mock_head.call_count, MD_PROBE_HOST_GIVE_UP)
+
+        self.assertIsNone(find_md_link("http://no-md.example.com/another-page"))
+        self.assertEqual(mock_head.call_count, MD_PROBE_HOST_GIVE_UP)
+
+    @patch('app.PROBE_SESSION.head')
+    def test_find_md_link_timeouts_are_not_misses(self, mock_head):
+        mock_head.side_effect = requests.exceptions.Timeout()
+
+        for i in range(MD_PROBE_HOST_GIVE_UP + 1):
+            self.assertIsNone(find_md_link(f"http://slow.example.com/page-{i}"))
+        # A slow host is still probed, since timeouts say nothing about .md mirrors
+        self.assertEqual(mock_head.call_count, MD_PROBE_HOST_GIVE_UP + 1)
+
+    @patch('app.batch_process_categories') # Patching where it's used
+    def test_generate_llms_txt_structure_and_format(self, mock_batch_process_categories):
+        # All categories are processed in one batch_process_categories call,
+        # which returns each category's results keyed by its title.
+        def mock_batch_side_effect(categorized_urls_map, md_check_categories, **kwargs):
+            results = {
+                "Introduction": [
                     ("Intro Page 1", "Description for intro 1.", "http://example.com/intro1", None),
                     ("Intro Page 2", "Description for intro 2.", "http://example.com/intro2", "http://example.com/intro2.md"),
-                ]
-            elif "http://example.com/api/ref1" in urls_being_processed[0]:
-                return [
+                ],
+                "API Reference": [
                     ("API Ref 1", "Description for API ref 1.", "http://example.com/api/ref1", "http://example.com/api/ref1.md"),
-                ]
-            return []
+                ],
+                "Other": [
+                    ("Other Page", "Description for other.", "http://example.com/otherpage", None)
+                ],
+            }
+            return {
+                category: results.get(category, []) if urls else []
+                for category, urls in categorized_urls_map.items()
+            }
 
-        mock_batch_process_urls.side_effect = mock_batch_side_effect
+        mock_batch_process_categories.side_effect = mock_batch_side_effect
 
         urls_for_llms_txt = [
             "http://example.com/intro1", # Introduction
@@ -135,35 +156,13 @@ class TestAppLogic(unittest.TestCase):
             "http://example.com/otherpage" # Other
         ]
 
-        # For 'Other', let batch_process_urls return an empty list to test no header for empty actuals
-        # Or let it return one item to test the 'Other' category.
-        # Let's refine side_effect for the "Other" category specifically.
-
-        def mock_batch_side_effect_detailed(*args, **kwargs):
-            urls_being_processed = args[0]
-            if not urls_being_processed: return [] # Should not happen if category_urls is not empty
-
-            if "intro" in urls_being_processed[0]:
-                 return [
-                    ("Intro Page 1", "Description for intro 1.", "http://example.com/intro1", None),
-                    ("Intro Page 2", "Description for intro 2.", "http://example.com/intro2", "http://example.com/intro2.md"),
-                ]
-            elif "api/ref1" in urls_being_processed[0]:
-                 return [
-                    ("API Ref 1", "Description for API ref 1.", "http://example.com/api/ref1", "http://example.com/api/ref1.md"),
-                ]
-            elif "otherpage" in urls_being_processed[0]:
-                return [
-                    ("Other Page", "Description for other.", "http://example.com/otherpage", None)
-                ]
-            return []
-        mock_batch_process_urls.side_effect = mock_batch_side_effect_detailed
-
-
         llms_txt_content = generate_llms_txt(
             urls_for_llms_txt, "Test Site", "Test site description."
         )
 
+        # Every category goes through a single fused batch
+        mock_batch_process_categories.assert_called_once()
+
         expected_parts = [
             "# Test Site",
             "> Test site description.",
@@ -177,8 +176,9 @@ class TestAppLogic(unittest.TestCase):
             "<!-- Generated by LLMS.txt Generator on " # Check for generation info start
         ]
 
-        for part in expected_parts:
-            self.assertIn(part, llms_txt_content)
+        # Report every missing part at once instead of stopping at the first
+        missing_parts = [part for part in expected_parts if part not in llms_txt_content]
+        self.assertEqual(missing_parts, [])
 
         self.assertNotIn("## Dashboard", llms_txt_content) # Example of an empty category
         self.assertNotIn("## Get started", llms_txt_content)
@@ -189,9 +189,12 @@ class TestAppLogic(unittest.TestCase):
 
 
     @patch('app.batch_process_urls')
-    def test_generate_llms_txt_empty_sections_not_printed(self, mock_batch_process_urls):
-        # Simulate that batch_process_urls returns empty lists for all categories except "Other"
-        # and "Other" itself is empty.
+    @patch('app.batch_process_categories')
+    def test_generate_llms_txt_empty_sections_not_printed(self, mock_batch_process_categories,
+                                                          mock_batch_process_urls):
+        # Simulate that processing returns no entries for any category, including "Other",
+        # and that the General Information fallback finds nothing either.
+        mock_batch_process_categories.return_value = {}
         mock_batch_process_urls.return_value = []
 
         urls_for_llms_txt = [
@@ -222,6 +225,214 @@ class TestAppLogic(unittest.TestCase):
         self.assertEqual(clean_description(None), "Resource information")
         self.assertEqual(clean_description(""), "Resource information")
 
+    @patch('app.generate_descriptions_batch_sync')
+    def test_describe_extracted_pages_batches_llm_calls(self, mock_batch_sync):
+        long_content = "Detailed page content. " * 10
+        extracted = [
+            ("http://example.com/a", "Docs resource", ("Page A", "Meta A", long_content, None)),
+            ("http://example.com/b", "Docs resource",
+             ("Page B", "Meta B", long_content, "http://example.com/b.md")),
+            ("http://example.com/short", "Docs resource", ("Short", "Meta short", "Tiny.", None)),
+        ]
+        mock_batch_sync.return_value = {
+            "http://example.com/a": "LLM A",
+            "http://example.com/b": None,
+        }
+
+        results = describe_extracted_pages(extracted, "some/model", "key")
+
+        mock_batch_sync.assert_called_once()
+        sent_urls = [page["url"] for page in mock_batch_sync.call_args.args[0]]
+        self.assertEqual(sent_urls, ["http://example.com/a", "http://example.com/b"])
+        self.assertEqual(results, [
+            ("Page A", "LLM A", "http://example.com/a", None),
+            ("Page B", "Meta B", "http://example.com/b", "http://example.com/b.md"),
+            ("Short", "Meta short", "http://example.com/short", None),
+        ])
+
+    @patch('app.generate_descriptions_batch_sync')
+    @patch('app.extract_page_for_batch')
+    def test_process_url_tasks_llm_keeps_going_after_a_failure(self, mock_extract, mock_batch_sync):
+        def extract(url, use_puppeteer, check_for_md):
+            if url.endswith("broken-page"):
+                raise RuntimeError("boom")
+            return ("Page", "Meta", "", None)
+
+        mock_extract.side_effect = extract
+        mock_batch_sync.return_value = {}
+        tasks = [
+            ("http://example.com/a", "Docs resource", False),
+            ("http://example.com/docs/broken-page", "Docs resource", True),
+            ("http://example.com/b", "Docs resource", False),
+        ]
+
+        results = process_url_tasks(tasks, use_llm=True, api_key="key")
+
+        self.assertEqual(results, [
+            ("Page", "Meta", "http://example.com/a", None),
+            ("Broken Page", "Docs resource", "http://example.com/docs/broken-page", None),
+            ("Page", "Meta", "http://example.com/b", None),
+        ])
+
+    @patch('app.SESSION.get')
+    def test_check_llm_crawler_accessibility(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, text=(
+            "User-agent: GPTBot\n"
+            "Disallow: /\n"
+            "\n"
+            "User-agent: CCBot\n"
+            "Disallow: /private/\n"
+            "\n"
+            "User-agent: *\n"
+            "Disallow:\n"
+        ))
+
+        blocked = check_llm_crawler_accessibility("example.com")
+
+        mock_get.assert_called_once_with("https://example.com/robots.txt", timeout=10)
+        self.assertEqual(blocked, ["GPTBot"])
+
+    @patch('app.SESSION.get')
+    def test_check_llm_crawler_accessibility_versioned_agents(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, text=(
+            "User-agent: iaskspider/2.0\n"
+            "Disallow: /\n"
+            "\n"
+            "User-agent: Brightbot 1.0\n"
+            "Disallow: /\n"
+            "\n"
+            "User-agent: *\n"
+            "Allow: /\n"
+        ))
+
+        blocked = check_llm_crawler_accessibility("example.com")
+
+        self.assertEqual(blocked, ["Brightbot 1.0", "iaskspider/2.0"])
+
+    def test_iter_sitemap_locs(self):
+        index_xml = (
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b'<sitemap><loc>https://example.com/sitemap-1.xml</loc></sitemap>'
+            b'<sitemap><loc></loc></sitemap>'
+            b'</sitemapindex>'
+        )
+        urlset_xml = (
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b'<url><loc>\n  https://example.com/a\n</loc><lastmod>2024-01-01</lastmod></url>'
+            b'<url><loc>https://example.com/b</loc></url>'
+            b'</urlset>'
+        )
+
+        self.assertEqual(list(iter_sitemap_locs(io.BytesIO(index_xml))),
+                         [(True, "https://example.com/sitemap-1.xml")])
+        self.assertEqual(list(iter_sitemap_locs(io.BytesIO(urlset_xml))),
+                         [(False, "https://example.com/a"), (False, "https://example.com/b")])
+
+    @patch('app.SESSION.get')
+    def test_fetch_sitemap_entries_gzipped(self, mock_get):
+        urlset_xml = (
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b'<url><loc>https://example.com/a</loc></url>'
+            b'</urlset>'
+        )
+        response = MagicMock(headers={"Content-Type": "application/xml"})
+        response.raw = io.BytesIO(gzip.compress(urlset_xml))
+        mock_get.return_value.__enter__.return_value = response
+
+        self.assertEqual(fetch_sitemap_entries("https://example.com/sitemap"),
+                         (["https://example.com/a"], []))
+
+        # A .gz sitemap the server already decompressed is parsed as plain XML
+        response = MagicMock(headers={"Content-Type": "application/x-gzip"})
+        response.raw = io.BytesIO(urlset_xml)
+        mock_get.return_value.__enter__.return_value = response
+
+        self.assertEqual(fetch_sitemap_entries("https://example.com/sitemap.xml.gz"),
+                         (["https://example.com/a"], []))
+
+    @patch('app.fetch_sitemap_entries')
+    def test_extract_urls_from_sitemap_index_keeps_order(self, mock_fetch):
+        sitemaps = {
+            "https://example.com/index.xml": ([], ["https://example.com/a.xml",
+                                                   "https://example.com/nested.xml",
+                                                   "https://example.com/a.xml"]),
+            "https://example.com/a.xml": (["https://example.com/a1", "https://example.com/a2"], []),
+            "https://example.com/nested.xml": ([], ["https://example.com/b.xml",
+                                                    "https://example.com/index.xml"]),
+            "https://example.com/b.xml": (["https://example.com/b1"], []),
+        }
+        mock_fetch.side_effect = lambda url: sitemaps[url]
+
+        urls = extract_urls_from_sitemap("https://example.com/index.xml")
+
+        self.assertEqual(urls, ["https://example.com/a1", "https://example.com/a2",
+                                "https://example.com/b1"])
+        self.assertEqual(mock_fetch.call_count, 4)
+
+    @patch('app.fetch_sitemap_entries')
+    def test_load_sitemap_urls_does_not_cache_failures(self, mock_fetch):
+        sitemap_url = "https://uncached.example.com/sitemap.xml"
+        self.addCleanup(load_sitemap_urls.clear)
+        mock_fetch.side_effect = requests.exceptions.ConnectionError("down")
+        with self.assertRaises(URLListError) as ctx:
+            load_sitemap_urls(sitemap_url)
+        self.assertEqual(ctx.exception.messages[0][0], "error")
+
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = (["https://uncached.example.com/a"], [])
+        self.assertEqual(load_sitemap_urls(sitemap_url), (["https://uncached.example.com/a"], []))
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    def test_extract_urls_from_csv(self):
+        csv_file = io.BytesIO(
+            b"name,Page URL,notes\n"
+            b"a, https://example.com/a ,x\n"
+            b"b,,y\n"
+            b"c,ftp://example.com/c,z\n"
+            b"d,http://example.com/d,w\n"
+        )
+        self.assertEqual(extract_urls_from_csv(csv_file),
+                         ["https://example.com/a", "http://example.com/d"])
+
+        # No URL-like header: fall back to the first column
+        csv_file = io.BytesIO(b"address,count\nhttps://example.com/e,1\nnot a url,2\n")
+        self.assertEqual(extract_urls_from_csv(csv_file), ["https://example.com/e"])
+
+    @patch('app.process_url')
+    def test_batch_process_categories_buckets_results_in_order(self, mock_process_url):
+        mock_process_url.side_effect = lambda url, default_desc, *args: (
+            url.split('/')[-1], default_desc, url, args[-1]
+        )
+        categorized = {
+            "Guides": ["http://example.com/g1", "http://example.com/g2"],
+            "Dashboard": [],
+            "Other": ["http://example.com/o1"],
+        }
+
+        results = batch_process_categories(categorized, {"Guides"})
+
+        self.assertEqual(mock_process_url.call_count, 3)
+        self.assertEqual(results, {
+            "Guides": [("g1", "Guides resource", "http://example.com/g1", True),
+                       ("g2", "Guides resource", "http://example.com/g2", True)],
+            "Dashboard": [],
+            "Other": [("o1", "Other resource", "http://example.com/o1", False)],
+        })
+
+    def test_derive_site_name(self):
+        self.assertEqual(derive_site_name("https://docs.example.com/intro"), "Example")
+        self.assertEqual(derive_site_name("https://example.com"), "Example")
+        self.assertEqual(derive_site_name("http://localhost:8000/"), "localhost:8000")
+
+    def test_model_options(self):
+        self.assertEqual(len(MODEL_OPTIONS), len(MODEL_VALUES))
+        self.assertEqual(MODEL_VALUES[DEFAULT_MODEL_INDEX], DEFAULT_MODEL)
+        self.assertEqual(MODEL_VALUE_BY_OPTION["Custom Model"], "custom")
+        for option, value in zip(MODEL_OPTIONS, MODEL_VALUES):
+            self.assertEqual(MODEL_VALUE_BY_OPTION[option], value)
+
 
 if __name__ == '__main__':
     unittest.main()
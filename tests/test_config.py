@@ -0,0 +1,26 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import validate_custom_model, validate_custom_models
+
+class TestModelValidation(unittest.TestCase):
+    def test_validate_custom_models_matches_single_validation(self):
+        names = [
+            "anthropic/claude-3-haiku",
+            " openai/gpt-4o-mini ",
+            "meta-llama/llama-3.1-8b-instruct:free",
+            "no-slash",
+            "",
+            None,
+            42,
+        ]
+        self.assertEqual(validate_custom_models(names),
+                         [True, True, True, False, False, False, False])
+        self.assertEqual(validate_custom_models(names),
+                         [validate_custom_model(name) for name in names])
+
+if __name__ == '__main__':
+    unittest.main()
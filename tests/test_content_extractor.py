@@ -1,17 +1,25 @@
 import unittest
 import sys
 import os
+from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+import threading
 
 # Add parent directory to path to import content_extractor
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from content_extractor import ContentExtractor
+import content_extractor
+from content_extractor import ContentExtractor, extract_content_sync, html_body_encoding
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
 
 class TestContentExtractor(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Initialize ContentExtractor without Puppeteer for these tests
-        # as we are providing HTML directly.
-        self.extractor = ContentExtractor(use_puppeteer=False)
+        # as we are providing HTML directly. It holds no per-test state,
+        # so one instance is shared by the whole class.
+        cls.extractor = ContentExtractor(use_puppeteer=False)
 
     def test_extract_main_content_simple(self):
         html_content = """
@@ -143,34 +151,173 @@ class TestContentExtractor(unittest.TestCase):
         # If readability's summary is empty, our code doesn't explicitly add the title before basic cleaning.
 
     def test_extract_title_and_meta(self):
-        html_content = """
-        <html><head><title> My Page Title </title>
-        <meta name="description" content=" This is the meta description.  ">
-        </head><body></body></html>
-        """
-        title, desc = self.extractor.extract_title_and_meta(html_content, "http://example.com/test")
-        self.assertEqual(title, "My Page Title")
-        self.assertEqual(desc, "This is the meta description.")
+        fallback_html = "<html><head></head><body></body></html>"
+        cases = [
+            # (html, url, expected title, expected description)
+            ("""
+            <html><head><title> My Page Title </title>
+            <meta name="description" content=" This is the meta description.  ">
+            </head><body></body></html>
+            """, "http://example.com/test", "My Page Title", "This is the meta description."),
+            ("""
+            <html><head><title> OG Title </title>
+            <meta property="og:description" content=" This is the OG description.  ">
+            </head><body></body></html>
+            """, "http://example.com/ogtest", "OG Title", "This is the OG description."),
+            # Fallback from URL path
+            (fallback_html, "http://example.com/fallback/page_name", "Page Name", ""),
+            (fallback_html, "http://example.com/", "example.com", ""),  # Fallback from domain
+        ]
+        for html_content, url, expected_title, expected_desc in cases:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.extractor.extract_title_and_meta(html_content, url),
+                    (expected_title, expected_desc)
+                )
 
-    def test_extract_title_and_meta_og(self):
-        html_content = """
-        <html><head><title> OG Title </title>
-        <meta property="og:description" content=" This is the OG description.  ">
-        </head><body></body></html>
-        """
-        title, desc = self.extractor.extract_title_and_meta(html_content, "http://example.com/ogtest")
-        self.assertEqual(title, "OG Title")
-        self.assertEqual(desc, "This is the OG description.")
-
-    def test_extract_title_and_meta_fallback(self):
-        html_content = "<html><head></head><body></body></html>"
-        title, desc = self.extractor.extract_title_and_meta(html_content, "http://example.com/fallback/page_name")
-        self.assertEqual(title, "Page Name") # Fallback from URL path
-        self.assertEqual(desc, "")
-
-        title, desc = self.extractor.extract_title_and_meta(html_content, "http://example.com/")
-        self.assertEqual(title, "example.com") # Fallback from domain
-        self.assertEqual(desc, "")
+    @patch('content_extractor.SESSION.get')
+    def test_get_page_content_requests_revalidates_cached_page(self, mock_get):
+        content_extractor._http_cache.clear()
+        first = MagicMock(status_code=200, encoding="utf-8", headers={"ETag": '"v1"'})
+        first.iter_content.return_value = [b"<html>cached</html>"]
+        not_modified = MagicMock(status_code=304, headers={})
+        mock_get.return_value.__enter__.side_effect = [first, not_modified]
+
+        url = "http://example.com/cached"
+        self.assertEqual(self.extractor.get_page_content_requests(url), "<html>cached</html>")
+        self.assertEqual(self.extractor.get_page_content_requests(url), "<html>cached</html>")
+
+        second_headers = mock_get.call_args_list[1].kwargs["headers"]
+        self.assertEqual(second_headers["If-None-Match"], '"v1"')
+        not_modified.iter_content.assert_not_called()
+        content_extractor._http_cache.clear()
+
+    @patch.object(ContentExtractor, '_extract_main_content', return_value="Main text")
+    def test_extract_main_content_caches_by_html(self, mock_extract):
+        content_extractor._main_content_cache.clear()
+        html = "<html><body><p>Same template</p></body></html>"
+
+        self.assertEqual(self.extractor.extract_main_content(html), "Main text")
+        self.assertEqual(ContentExtractor().extract_main_content(html), "Main text")
+
+        mock_extract.assert_called_once_with(html)
+        content_extractor._main_content_cache.clear()
+
+    @patch.object(content_extractor, 'EXTRACTION_PROCESS_MIN_CHARS', 50)
+    @patch.object(ContentExtractor, '_extract_main_content_in_pool', return_value="Pooled text")
+    def test_extract_main_content_large_pages_use_pool(self, mock_pool):
+        content_extractor._main_content_cache.clear()
+        small = "<p>Small</p>"
+        large = "<html><body><p>" + "Large page text. " * 10 + "</p></body></html>"
+
+        self.assertNotEqual(self.extractor.extract_main_content(small), "Pooled text")
+        self.assertEqual(self.extractor.extract_main_content(large), "Pooled text")
+
+        mock_pool.assert_called_once_with(large)
+        content_extractor._main_content_cache.clear()
+
+    def test_extract_title_and_meta_head_only(self):
+        html = (
+            "<html><head><title>Head Title</title>"
+            "<meta name='description' content='Head meta'></head>"
+            "<body><title>Body Title</title>"
+            "<meta name='description' content='Body meta'></body></html>"
+        )
+        self.assertEqual(self.extractor.extract_title_and_meta(html), ("Head Title", "Head meta"))
+
+        # A "</head>" inside a script must not hide the real head tags
+        html = (
+            "<html><head><script>var s = '</head>';</script>"
+            "<title>T</title><meta name='description' content='D'></head></html>"
+        )
+        self.assertEqual(self.extractor.extract_title_and_meta(html), ("T", "D"))
+
+        # ...even when the title comes before the script and only the description after it
+        html = (
+            "<html><head><title>T</title><script>var s = '</head>';</script>"
+            "<meta name='description' content='D'></head></html>"
+        )
+        self.assertEqual(self.extractor.extract_title_and_meta(html), ("T", "D"))
+
+    def test_construct_in_worker_thread(self):
+        # Page workers have no event loop; construction must not need one
+        errors = []
+
+        def construct():
+            try:
+                ContentExtractor(use_puppeteer=True)
+                ContentExtractor()
+            except Exception as e:
+                errors.append(e)
+
+        worker = threading.Thread(target=construct)
+        worker.start()
+        worker.join()
+        self.assertEqual(errors, [])
+
+    def test_filter_puppeteer_request(self):
+        image = MagicMock(resourceType="image", abort=AsyncMock(), continue_=AsyncMock())
+        document = MagicMock(resourceType="document", abort=AsyncMock(), continue_=AsyncMock())
+
+        asyncio.run(content_extractor._filter_puppeteer_request(image))
+        asyncio.run(content_extractor._filter_puppeteer_request(document))
+
+        image.abort.assert_awaited_once()
+        image.continue_.assert_not_called()
+        document.continue_.assert_awaited_once()
+        document.abort.assert_not_called()
+
+    def test_html_body_encoding(self):
+        self.assertEqual(html_body_encoding('text/html; charset="iso-8859-2"', b"<html>"),
+                         "iso-8859-2")
+        meta_charset = b'<head><meta charset="windows-1252"></head>'
+        self.assertEqual(html_body_encoding("text/html", meta_charset), "windows-1252")
+        # No declared charset: UTF-8 rather than requests' ISO-8859-1 default
+        self.assertEqual(html_body_encoding("text/html", b"<html></html>"), "utf-8")
+
+    @patch('content_extractor.SESSION.get')
+    def test_get_page_content_requests_skips_non_html(self, mock_get):
+        response = MagicMock(status_code=200, headers={"Content-Type": "application/pdf"})
+        mock_get.return_value.__enter__.return_value = response
+
+        self.assertEqual(self.extractor.get_page_content_requests("http://example.com/doc.pdf"), "")
+        response.iter_content.assert_not_called()
+
+    @patch.object(ContentExtractor, 'get_page_content_requests')
+    def test_extract_content_sync_reuses_cached_extraction(self, mock_fetch):
+        content_extractor._extraction_cache.clear()
+        mock_fetch.side_effect = [
+            "<html><head><title>Cached</title></head><body><p>Body</p></body></html>",
+            "",
+        ]
+
+        url = "http://example.com/extraction-cache"
+        first = extract_content_sync(url)
+        second = extract_content_sync(url)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], "Cached")
+        mock_fetch.assert_called_once_with(url)
+        content_extractor._extraction_cache.clear()
+
+    @patch('content_extractor.SESSION.get')
+    def test_extract_content_sync_from_fixture(self, mock_get):
+        content_extractor._extraction_cache.clear()
+        content_extractor._http_cache.clear()
+        with open(os.path.join(FIXTURES_DIR, "example.html"), "rb") as f:
+            body = f.read()
+        response = MagicMock(status_code=200, headers={"Content-Type": "text/html; charset=UTF-8"})
+        response.iter_content.return_value = [body]
+        mock_get.return_value.__enter__.return_value = response
+
+        title, meta_desc, main_content = extract_content_sync("https://example.com/fixture")
+
+        self.assertEqual(title, "Example Domain")
+        self.assertEqual(meta_desc, "This domain is for use in illustrative examples in documents.")
+        self.assertIn("without prior coordination", main_content)
+        self.assertNotIn("Copyright notice", main_content)
+        content_extractor._extraction_cache.clear()
+        content_extractor._http_cache.clear()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import sys
+import os
+import tempfile
+from cachetools import LRUCache
+
+# Add parent directory to path to import openrouter_client
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import openrouter_client
+from openrouter_client import _description_cache_key, _get_cached_descriptions, _cache_descriptions
+from openrouter_client import _sync_client, OpenRouterClient
+from utils import run_async
+
+class TestDescriptionCache(unittest.TestCase):
+
+    def setUp(self):
+        openrouter_client._description_cache.clear()
+        self.addCleanup(openrouter_client._description_cache.clear)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _reset_store(self):
+        if openrouter_client._description_db:
+            openrouter_client._description_db.close()
+        openrouter_client._description_db = None
+
+    def test_descriptions_persist_across_memory_cache(self):
+        path = os.path.join(self.tmpdir.name, "descriptions.db")
+        key = _description_cache_key("Page text", "Title", "https://example.com/", "provider/model")
+
+        with patch.object(openrouter_client, 'DESCRIPTION_CACHE_PATH', path):
+            self._reset_store()
+            self.addCleanup(self._reset_store)
+            _cache_descriptions({key: "A stored description.", "other": "Another one."})
+
+            # A restart loses the in-memory LRU but not the SQLite tier
+            openrouter_client._description_cache.clear()
+            self._reset_store()
+            self.assertEqual(_get_cached_descriptions([key, "unknown"]),
+                             {key: "A stored description."})
+
+            with patch.object(openrouter_client, 'DESCRIPTION_CACHE_TTL', -1):
+                openrouter_client._description_cache.clear()
+                self.assertEqual(_get_cached_descriptions([key]), {})
+
+                # Reopening the store deletes the expired rows
+                self._reset_store()
+                _get_cached_descriptions([key])
+                rows = openrouter_client._description_db.execute(
+                    "SELECT COUNT(*) FROM descriptions"
+                ).fetchone()
+                self.assertEqual(rows[0], 0)
+
+    def test_batch_descriptions_are_cached(self):
+        path = os.path.join(self.tmpdir.name, "descriptions.db")
+        pages = [{"url": f"https://example.com/{i}", "content": f"Page {i}"} for i in range(3)]
+        answers = {page["url"]: f"About {page['url']}" for page in pages}
+        calls = []
+
+        async def describe(batch, *args):
+            calls.append(batch)
+            return {page["url"]: answers[page["url"]] for page in batch}
+
+        client = OpenRouterClient("key")
+        with patch.object(openrouter_client, 'DESCRIPTION_CACHE_PATH', path), \
+                patch.object(client, '_describe_batch', new=describe):
+            self._reset_store()
+            self.addCleanup(self._reset_store)
+            self.assertEqual(asyncio.run(client.generate_descriptions_batch(pages)), answers)
+
+            openrouter_client._description_cache.clear()
+            self._reset_store()
+            self.assertEqual(asyncio.run(client.generate_descriptions_batch(pages)), answers)
+        self.assertEqual(len(calls), 1)
+
+    def test_memory_only_without_cache_path(self):
+        key = _description_cache_key("Other text", "", "https://example.com/a", "provider/model")
+        with patch.object(openrouter_client, 'DESCRIPTION_CACHE_PATH', ""):
+            self._reset_store()
+            _cache_descriptions({key: "In memory."})
+            self.assertEqual(_get_cached_descriptions([key]), {key: "In memory."})
+            self.assertIsNone(openrouter_client._description_db)
+
+class TestSyncClients(unittest.TestCase):
+
+    @patch.object(openrouter_client, '_sync_clients', LRUCache(maxsize=2))
+    def test_least_recently_used_client_is_closed(self):
+        first = _sync_client("key-1")
+        self.assertIs(_sync_client("key-1"), first)
+        self.assertNotIn("key-1", openrouter_client._sync_clients)
+
+        http_client = run_async(self._open(first))
+        _sync_client("key-2")
+        _sync_client("key-3")
+        self.assertEqual(len(openrouter_client._sync_clients), 2)
+        self.assertTrue(http_client.is_closed)
+        self.assertIsNot(_sync_client("key-1"), first)
+
+    @staticmethod
+    async def _open(client):
+        return client._http_client()
+
+class TestBatchConcurrency(unittest.TestCase):
+
+    @patch.object(openrouter_client, 'LLM_MAX_CONCURRENT_REQUESTS', 2)
+    def test_requests_in_flight_are_capped(self):
+        openrouter_client._description_cache.clear()
+        self.addCleanup(openrouter_client._description_cache.clear)
+        in_flight = []
+        peak = []
+
+        async def track(result):
+            in_flight.append(None)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return result
+
+        client = OpenRouterClient("key")
+        pages = [{"url": f"https://example.com/{i}", "content": f"Page {i}"} for i in range(40)]
+        # Every batch fails, so each page also goes through the per-page fallback
+        with patch.object(client, '_describe_batch', new=lambda *args: track({})), \
+                patch.object(client, '_request_description', new=lambda *args: track("D")):
+            descriptions = asyncio.run(client.generate_descriptions_batch(pages))
+
+        self.assertEqual(set(descriptions.values()), {"D"})
+        self.assertEqual(max(peak), 2)
+
+if __name__ == '__main__':
+    unittest.main()
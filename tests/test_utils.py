@@ -2,10 +2,14 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import requests
 
 # Add parent directory to path to import utils
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils import normalize_url, is_valid_url, get_domain, get_base_url, slugify
+from utils import canonicalize_url, dedupe_urls, host_slot, extract_relative_links
+from utils import get_content_type, get_content_types, is_html_page
+import utils
 
 class TestUtils(unittest.TestCase):
     def test_normalize_url(self):
@@ -33,15 +37,42 @@ class TestUtils(unittest.TestCase):
             "https://example.com/page/"
         )
     
+    def test_canonicalize_url(self):
+        self.assertEqual(
+            canonicalize_url("HTTPS://Example.COM:443/docs/page/?b=2&utm_source=x&a=1#top"),
+            "https://example.com/docs/page?a=1&b=2"
+        )
+        self.assertEqual(
+            canonicalize_url("https://example.com/page?fbclid=abc&id=7&gclid=xyz"),
+            "https://example.com/page?id=7"
+        )
+        self.assertEqual(canonicalize_url("http://example.com:80"), "http://example.com/")
+        self.assertEqual(canonicalize_url("http://example.com:8080/"), "http://example.com:8080/")
+
+    def test_dedupe_urls(self):
+        urls = [
+            "https://example.com/docs/",
+            "https://EXAMPLE.com/docs",
+            "https://example.com/docs?utm_campaign=launch",
+            "https://example.com/blog",
+            "https://example.com/docs/",
+        ]
+        self.assertEqual(dedupe_urls(urls),
+                         ["https://example.com/docs/", "https://example.com/blog"])
+    
     def test_is_valid_url(self):
         # Valid URLs
         self.assertTrue(is_valid_url("https://example.com"))
         self.assertTrue(is_valid_url("http://example.com/page"))
+        self.assertTrue(is_valid_url("HTTPS://Example.com"))
         
         # Invalid URLs
         self.assertFalse(is_valid_url("example.com"))
         self.assertFalse(is_valid_url("ftp://example.com"))
         self.assertFalse(is_valid_url(""))
+        self.assertFalse(is_valid_url("mailto:someone@example.com"))
+        self.assertFalse(is_valid_url("http:example.com"))
+        self.assertFalse(is_valid_url("https://"))
     
     def test_get_domain(self):
         self.assertEqual(get_domain("https://example.com/path"), "example.com")
@@ -57,5 +88,82 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(slugify("Special Ch@r$!"), "special-chr")
         self.assertEqual(slugify("Multiple---Hyphens"), "multiple-hyphens")
 
+    def test_host_slot(self):
+        slot = host_slot("https://example.com/a")
+        self.assertIs(host_slot("https://EXAMPLE.com/b?x=1"), slot)
+        self.assertIsNot(host_slot("https://other.example.com/a"), slot)
+
+    def test_create_session_retries(self):
+        session = utils.create_session()
+        self.assertEqual(session.get_adapter("https://example.com").max_retries.total,
+                         utils.MAX_RETRIES)
+        probe_session = utils.create_session(max_retries=0)
+        self.assertEqual(probe_session.get_adapter("https://example.com").max_retries.total, 0)
+
+    @patch('utils.SESSION.head')
+    def test_get_content_type_caches_by_canonical_url(self, mock_head):
+        utils._content_type_cache.clear()
+        mock_head.return_value = MagicMock(headers={"Content-Type": "Text/HTML; charset=utf-8"})
+
+        self.assertEqual(get_content_type("https://example.com/page"), "text/html")
+        self.assertEqual(get_content_type("https://EXAMPLE.com/page/#top"), "text/html")
+        mock_head.assert_called_once()
+
+        # Failed probes are retried rather than remembered
+        mock_head.side_effect = requests.exceptions.ConnectionError("down")
+        self.assertEqual(get_content_type("https://example.com/flaky"), "")
+        self.assertEqual(get_content_type("https://example.com/flaky"), "")
+        self.assertEqual(mock_head.call_count, 3)
+        utils._content_type_cache.clear()
+
+    @patch('utils.SESSION.head')
+    def test_get_content_types(self, mock_head):
+        utils._content_type_cache.clear()
+        content_types = {
+            "https://example.com/a": "text/html",
+            "https://example.org/b.json": "application/json",
+        }
+        mock_head.side_effect = lambda url, **kwargs: MagicMock(
+            headers={"Content-Type": content_types[url]}
+        )
+
+        urls = ["https://example.com/a", "https://example.org/b.json", "https://example.com/a"]
+        self.assertEqual(get_content_types(urls), content_types)
+        self.assertEqual(mock_head.call_count, 2)
+        self.assertEqual(get_content_types([]), {})
+        utils._content_type_cache.clear()
+
+    @patch('utils.SESSION.head')
+    def test_is_html_page_skips_head_for_media(self, mock_head):
+        utils._content_type_cache.clear()
+        mock_head.return_value = MagicMock(headers={"Content-Type": "text/html"})
+
+        self.assertFalse(is_html_page("https://example.com/files/report.PDF"))
+        mock_head.assert_not_called()
+        self.assertTrue(is_html_page("https://example.com/docs/page"))
+        mock_head.assert_called_once()
+        utils._content_type_cache.clear()
+
+    def test_extract_relative_links(self):
+        html = """<html><head><link href="/style.css"></head><body>
+            <a href="/docs/intro">Intro</a> <a href="guide">Guide</a> <a>No href</a>
+            <a href="/docs/intro">Intro again</a> <a href="#top">Top</a>
+            <a href="mailto:a@example.com">Mail</a> <a href="javascript:void(0)">JS</a>
+            <a href="https://other.com/page">Other</a> <img src="/logo.png">
+        </body></html>"""
+        self.assertEqual(
+            extract_relative_links(html, "https://example.com/docs/"),
+            ["https://example.com/docs/intro", "https://example.com/docs/guide"]
+        )
+        self.assertEqual(extract_relative_links("", "https://example.com/"), [])
+        self.assertEqual(
+            extract_relative_links(
+                '<?xml version="1.0" encoding="utf-8"?>'
+                '<html><body><a href="/x">x</a></body></html>',
+                "https://example.com/"
+            ),
+            ["https://example.com/x"]
+        )
+
 if __name__ == '__main__':
     unittest.main()
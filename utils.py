@@ -1,85 +1,288 @@
 import re
+import asyncio
 import logging
-from urllib.parse import urlparse, urljoin
+import threading
+import concurrent.futures
+from functools import lru_cache
+from urllib.parse import urlparse, urljoin, urlunparse
 import requests
-from bs4 import BeautifulSoup
+from cachetools import TTLCache
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from config import (
+    USER_AGENT,
+    MAX_RETRIES,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    MAX_CONNECTIONS_PER_HOST,
+    MAX_WORKERS,
+    CONTENT_TYPE_CACHE_MAXSIZE,
+    CONTENT_TYPE_CACHE_TTL
+)
 
 logger = logging.getLogger('llms_generator.utils')
 
+# slugify patterns, compiled once instead of looked up in re's cache on every call
+SLUG_INVALID_CHARS_RE = re.compile(r'[^a-z0-9\s\-]+')
+SLUG_SEPARATORS_RE = re.compile(r'[\s\-]+')
+
+def create_session(max_retries=MAX_RETRIES):
+    """Create a requests session with keep-alive connection pooling and retries.
+
+    Reusing one session lets repeated requests to the same host (sitemap
+    indexes, .md probes, robots.txt) skip the TCP and TLS handshakes.
+
+    Args:
+        max_retries: Retries per request; pass 0 for short probes whose timeout must hold
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        # Every encoding urllib3 can decode here (adds br when brotli is installed)
+        "Accept-Encoding": ACCEPT_ENCODING
+    })
+    return session
+
+# Shared keep-alive session for the HEAD probes made from this module
+SESSION = create_session()
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+def host_slot(url):
+    """Return the semaphore that caps concurrent requests to the URL's host.
+
+    Page fetches and .md probes both acquire it, so a single site never sees
+    more than MAX_CONNECTIONS_PER_HOST requests from this process at once.
+    """
+    host = _parse(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST)
+            _host_semaphores[host] = semaphore
+    return semaphore
+
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+def run_async(coro):
+    """Run a coroutine on the shared background event loop and wait for its result.
+
+    One long-lived loop serves every synchronous caller, so loop setup is paid
+    once and loop-bound resources (the Puppeteer browser, the OpenRouter client)
+    can be reused across calls and threads.
+    """
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever, name="async-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop).result()
+
+@lru_cache(maxsize=8192)
+def _parse(url):
+    """urlparse memoised, since the same URL is usually split by several helpers in turn."""
+    return urlparse(url)
+
+# URLs urlparse would return unchanged: lowercase http(s) scheme, no query, fragment or
+# ;params, no IPv6 brackets it might reject, and no whitespace/control characters to strip
+PLAIN_URL_RE = re.compile(r'https?://[^?#;\[\]\x00-\x20]*\Z')
+
 def normalize_url(url):
     """Normalize a URL by removing query parameters and fragments."""
-    parsed = urlparse(url)
+    if PLAIN_URL_RE.match(url):
+        return url
+    parsed = _parse(url)
     return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
 
+DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+TRACKING_PARAM_PREFIXES = ("utm_", "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid")
+
+def canonicalize_url(url):
+    """Canonicalize a URL so trivially different spellings of one page compare equal.
+
+    Lowercases scheme and host, drops the default port, the fragment, a trailing
+    slash on non-root paths and tracking parameters (utm_*, ad click IDs), and
+    sorts the query.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    default_port = DEFAULT_PORTS.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    path = parsed.path.rstrip('/') or '/'
+    query = '&'.join(sorted(
+        param for param in parsed.query.split('&')
+        if param and not param.split('=', 1)[0].lower().startswith(TRACKING_PARAM_PREFIXES)
+    ))
+    return urlunparse((scheme, netloc, path, parsed.params, query, ''))
+
+def dedupe_urls(urls):
+    """Drop URLs whose canonical form was already seen, keeping the first spelling and order."""
+    seen = set()
+    unique_urls = []
+    for url in urls:
+        key = canonicalize_url(url)
+        if key not in seen:
+            seen.add(key)
+            unique_urls.append(url)
+    return unique_urls
+
+VALID_URL_PREFIXES = ('http://', 'https://')
+
 def is_valid_url(url):
     """Check if a URL is valid."""
-    parsed = urlparse(url)
-    return bool(parsed.netloc and parsed.scheme in ['http', 'https'])
+    # Reject anchors, mailto: links, bare domains etc. without parsing; a valid URL
+    # must start with the scheme and '//' (urlparse itself ignores case and leading space)
+    if not url or not url.lstrip()[:8].lower().startswith(VALID_URL_PREFIXES):
+        return False
+    return bool(_parse(url).netloc)
 
 def get_domain(url):
     """Extract domain from URL."""
-    parsed = urlparse(url)
+    parsed = _parse(url)
     return parsed.netloc
 
 def get_base_url(url):
     """Get base URL (scheme + domain)."""
-    parsed = urlparse(url)
+    parsed = _parse(url)
     return f"{parsed.scheme}://{parsed.netloc}"
 
+# Content-Types keyed by canonical URL, so repeat checks skip the HEAD round-trip
+_content_type_cache = TTLCache(maxsize=CONTENT_TYPE_CACHE_MAXSIZE, ttl=CONTENT_TYPE_CACHE_TTL)
+_content_type_cache_lock = threading.Lock()
+
 def get_content_type(url, timeout=10):
     """Determine content type of a URL."""
+    key = canonicalize_url(url)
+    with _content_type_cache_lock:
+        cached = _content_type_cache.get(key)
+    if cached is not None:
+        return cached
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        headers = {  # User-Agent comes from the session
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         }
-        response = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        response = SESSION.head(url, headers=headers, timeout=timeout, allow_redirects=True)
         content_type = response.headers.get('Content-Type', '')
-        return content_type.split(';')[0].strip().lower()
+        content_type = content_type.split(';')[0].strip().lower()
+        # Failures below are not cached, so a flaky URL is retried next time
+        with _content_type_cache_lock:
+            _content_type_cache[key] = content_type
+        return content_type
     except Exception as e:
         logger.warning(f"Could not determine content type for {url}: {str(e)}")
         return ""
 
+def get_content_types(urls, timeout=10, max_workers=MAX_WORKERS):
+    """Determine the content types of many URLs with concurrent HEAD requests.
+
+    Args:
+        urls: URLs to probe
+        timeout: Per-request timeout in seconds
+        max_workers: Maximum number of HEAD requests in flight
+
+    Returns:
+        Dict of URL to content type ("" when it could not be determined)
+    """
+    def probe(url):
+        # Overlap round-trips across hosts without flooding any single one
+        with host_slot(url):
+            return get_content_type(url, timeout)
+
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    workers = min(max_workers, len(unique_urls))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(unique_urls, executor.map(probe, unique_urls)))
+
 def is_html_page(url, timeout=10):
     """Check if a URL points to an HTML page."""
+    # Images, archives and PDFs are recognisable from the URL alone, so skip the HEAD
+    if is_media_file(url):
+        return False
     content_type = get_content_type(url, timeout)
     return content_type in ['text/html', 'application/xhtml+xml']
 
+MEDIA_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.mp4', '.webm',
+    '.mp3', '.wav', '.pdf', '.zip', '.tar.gz'
+)
+
 def is_media_file(url):
     """Check if a URL points to a media file."""
-    extensions = ['.jpg', '.jpeg', '.png', '.gif', '.svg', '.mp4', '.webm', '.mp3', '.wav', '.pdf', '.zip', '.tar.gz']
-    return any(url.lower().endswith(ext) for ext in extensions)
+    # str.endswith takes the whole tuple, so the suffix test runs in one C call
+    return url.lower().endswith(MEDIA_EXTENSIONS)
+
+class _AnchorHrefCollector:
+    """lxml parser target that records <a href> values as the parser emits start tags."""
+
+    def __init__(self):
+        self.hrefs = []
+
+    def start(self, tag, attrib):
+        if tag == 'a':
+            href = attrib.get('href')
+            if href is not None:
+                self.hrefs.append(href)
+
+    def close(self):
+        return self.hrefs
+
+SKIPPED_HREF_PREFIXES = ('#', 'javascript:', 'mailto:', 'tel:', 'data:')
 
 def extract_relative_links(html_content, base_url):
     """Extract and normalize relative links from HTML content."""
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Stream the page through lxml's parser and keep only the hrefs, without building a tree
+    collector = _AnchorHrefCollector()
+    parser = etree.HTMLParser(target=collector)
+    try:
+        parser.feed(html_content)
+        hrefs = parser.close()
+    except etree.LxmlError:
+        # Nothing parseable (e.g. an empty document)
+        hrefs = collector.hrefs
+    base_domain = get_domain(base_url)
     links = []
+    # Navigation links repeat on every page; keep each target once, in discovery order
+    seen = set()
     
-    for a_tag in soup.find_all('a', href=True):
-        href = a_tag['href']
-        # Skip anchors, javascript, and mailto links
-        if href.startswith('#') or href.startswith('javascript:') or href.startswith('mailto:'):
+    for href in hrefs:
+        # Skip anchors and non-navigational schemes (javascript, mailto, tel, data)
+        if href.startswith(SKIPPED_HREF_PREFIXES):
             continue
         
         # Convert relative URLs to absolute
         absolute_url = urljoin(base_url, href)
         
         # Ensure we're still on the same domain
-        if get_domain(absolute_url) == get_domain(base_url):
+        if absolute_url not in seen and get_domain(absolute_url) == base_domain:
+            seen.add(absolute_url)
             links.append(absolute_url)
     
     return links
 
 def slugify(text):
     """Create a URL-friendly slug from text."""
-    # Convert to lowercase
-    text = text.lower()
-    # Replace spaces with hyphens
-    text = re.sub(r'\s+', '-', text)
-    # Remove special characters
-    text = re.sub(r'[^a-z0-9\-]', '', text)
-    # Remove duplicate hyphens
-    text = re.sub(r'-+', '-', text)
-    # Remove leading/trailing hyphens
-    text = text.strip('-')
-    return text
+    # Remove special characters (but keep whitespace and hyphens as separators)
+    text = SLUG_INVALID_CHARS_RE.sub('', text.lower())
+    # Collapse each run of whitespace/hyphens into one hyphen, trimming the ends
+    return SLUG_SEPARATORS_RE.sub('-', text).strip('-')